@@ -5,5 +5,6 @@ class ReturntoworkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'returnToWork'
 
-
-   
\ No newline at end of file
+    def ready(self):
+        # Register signal handlers that keep progress counters and module manifests in step with content changes
+        from returnToWork import signals
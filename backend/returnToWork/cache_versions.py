@@ -0,0 +1,36 @@
+"""
+Version counters kept in Django's cache. Cached data is stored under a key that includes the
+current version of whatever it was built from; bumping the version makes the old entries
+unreachable, so they are never read again and simply age out of the cache.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_versions(keys):
+    """Return {key: version}, starting unknown keys from the current time so evicted counters never reuse an old version"""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def get_version(key):
+    return get_versions([key])[key]
+
+
+def bump_versions(*keys):
+    """Bump every given counter, now and again once the surrounding transaction commits"""
+    def bump():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
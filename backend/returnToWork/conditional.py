@@ -0,0 +1,66 @@
+"""
+Conditional GET for content viewsets. Before a list or detail response is serialized, one
+aggregate query (the latest updated_at and the row count of the queryset) gives an ETag and
+Last-Modified for it; a request whose If-None-Match / If-Modified-Since still matches is
+answered with 304 Not Modified without running the serializer.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """Adds ETag / Last-Modified validators to the list and retrieve actions of a ModelViewSet"""
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_source(self, queryset):
+        """Return (fingerprint, last_modified) describing every row the response is built from"""
+        stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return f"{stats['count']}:{stats['last_modified']}", stats['last_modified']
+
+    def get_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            except (TypeError, ValueError, ValidationError):
+                # a malformed pk; no validators, and get_object() answers with the usual 404
+                return None, None
+
+        fingerprint, last_modified = self.get_validator_source(queryset)
+        # The path is part of the tag so different filters and pages never share one
+        etag = quote_etag(hashlib.md5(f"{request.get_full_path()}:{fingerprint}".encode()).hexdigest())
+        return f'W/{etag}', int(last_modified.timestamp()) if last_modified else None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag, self.last_modified = None, None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        self.etag, self.last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+        return response
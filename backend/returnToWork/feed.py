@@ -0,0 +1,68 @@
+"""
+Ranked module feed. Modules are ordered for a user with pinned modules first, then unfinished
+before completed, then by how many of the user's tags they share, then by upvotes. The
+catalogue part of that ranking is one annotated query cached per (tag set, 'modules' version),
+so every user with the same tags shares it; pinned and completed state comes from the user's
+trackers, which are small and always read fresh.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, Q, Value
+
+from returnToWork.models import Module, ProgressTracker
+from returnToWork.response_cache import get_group_version
+from returnToWork.serializers import ModuleSerializer
+
+
+def _ranking_key(tag_ids, version):
+    tag_set = hashlib.md5(','.join(map(str, tag_ids)).encode()).hexdigest()
+    return f'module-feed:{version}:{tag_set}'
+
+
+def rank_modules(tag_ids):
+    """Serialize every module ordered by shared tags, then upvotes, with one annotated query plus the tag prefetch"""
+    if tag_ids:
+        matching_tags = Count('tags', filter=Q(tags__in=tag_ids), distinct=True)
+    else:
+        matching_tags = Value(0, output_field=IntegerField())
+
+    modules = (
+        Module.objects.annotate(matching_tags=matching_tags)
+        .order_by('-matching_tags', '-upvotes', 'pk')
+        .prefetch_related('tags')
+    )
+    return [dict(ModuleSerializer(module).data, matching_tags=module.matching_tags) for module in modules]
+
+
+def get_ranked_modules(tag_ids):
+    """Return the catalogue ranking for a tag set, rebuilt whenever a module, its tags or its upvotes change"""
+    if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+        return rank_modules(tag_ids)
+
+    key = _ranking_key(tag_ids, get_group_version('modules'))
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = rank_modules(tag_ids)
+        cache.set(key, ranking, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', None))
+    return ranking
+
+
+def get_module_feed(user):
+    """Return the ranked feed for a user as a list of module dicts with their pinned, completed and liked state"""
+    tag_ids = sorted(user.tags.values_list('id', flat=True))
+    trackers = {
+        module_id: (pinned, completed, liked)
+        for module_id, pinned, completed, liked in ProgressTracker.objects.filter(user=user)
+        .values_list('module_id', 'pinned', 'completed', 'hasLiked')
+    }
+
+    feed = []
+    for module in get_ranked_modules(tag_ids):
+        pinned, completed, liked = trackers.get(module['id'], (False, False, False))
+        feed.append(dict(module, pinned=pinned, completed=completed, hasLiked=liked))
+
+    # stable sort, so modules keep their catalogue order within each group
+    feed.sort(key=lambda module: (not module['pinned'], module['completed']))
+    return feed
@@ -0,0 +1,39 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+TRUE_VALUES = ('true', '1', 'yes')
+FALSE_VALUES = ('false', '0', 'no')
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    Exact-match filtering on the fields a view lists in `filter_fields`, e.g.
+    ?moduleID=3&is_published=true. Only indexed columns should be listed, so every
+    filter narrows the query through an index instead of scanning the table.
+    """
+
+    def parse_value(self, field, value):
+        if field.get_internal_type() == 'BooleanField':
+            if value.lower() in TRUE_VALUES:
+                return True
+            if value.lower() in FALSE_VALUES:
+                return False
+            raise ValidationError({field.name: f"'{value}' is not a valid boolean."})
+
+        target = field.target_field if field.is_relation else field
+        try:
+            return target.to_python(value)
+        except DjangoValidationError as error:
+            raise ValidationError({field.name: error.messages})
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        for name in getattr(view, 'filter_fields', ()):
+            value = request.query_params.get(name)
+            if value is None or value == '':
+                continue
+            field = queryset.model._meta.get_field(name)
+            lookups[field.attname if field.is_relation else name] = self.parse_value(field, value)
+        return queryset.filter(**lookups) if lookups else queryset
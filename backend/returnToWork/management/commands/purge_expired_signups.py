@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from returnToWork.models import PendingSignup
+
+
+class Command(BaseCommand):
+    help = 'Deletes pending sign-ups whose verification link has expired'
+
+    def handle(self, *args, **options):
+        removed = PendingSignup.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} expired sign-ups'))
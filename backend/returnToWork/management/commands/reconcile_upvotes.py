@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from returnToWork.models import Module, ProgressTracker
+from returnToWork.response_cache import invalidate
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every Module.upvotes from the likes recorded on ProgressTracker to repair drifted counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', type=int, help='Only reconcile this module ID')
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted modules without changing them')
+
+    def handle(self, *args, **options):
+        likes = (
+            ProgressTracker.objects.filter(module=OuterRef('pk'), hasLiked=True)
+            .order_by().values('module').annotate(total=Count('pk')).values('total')
+        )
+        modules = Module.objects.annotate(
+            liked=Coalesce(Subquery(likes, output_field=IntegerField()), 0)
+        )
+        if options['module']:
+            modules = modules.filter(pk=options['module'])
+
+        drifted = list(modules.exclude(upvotes=F('liked')).values_list('pk', 'upvotes', 'liked'))
+        for module_id, upvotes, liked in drifted:
+            self.stdout.write(f'Module {module_id}: {upvotes} upvotes, {liked} likes')
+
+        if drifted and not options['dry_run']:
+            Module.objects.filter(pk__in=[module_id for module_id, _, _ in drifted]).update(
+                upvotes=Coalesce(Subquery(likes, output_field=IntegerField()), 0)
+            )
+            invalidate('modules', 'tags')
+
+        verb = 'Found' if options['dry_run'] else 'Reconciled'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(drifted)} drifted modules'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from returnToWork.models import ProgressTracker
+
+
+class Command(BaseCommand):
+    help = 'Recounts every ProgressTracker from scratch to repair drifted incremental counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', type=int, help='Only recount trackers for this module ID')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of trackers recounted per batch')
+
+    def handle(self, *args, **options):
+        trackers = ProgressTracker.objects.order_by('id')
+        if options['module']:
+            trackers = trackers.filter(module_id=options['module'])
+
+        pairs = list(trackers.values_list('user_id', 'module_id'))
+        batch_size = options['batch_size']
+
+        for start in range(0, len(pairs), batch_size):
+            ProgressTracker.recompute(pairs[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Recounted {len(pairs)} progress trackers'))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from returnToWork.outbox import BATCH_SIZE, POLL_SECONDS, send_pending_mail
+
+
+class Command(BaseCommand):
+    help = 'Sends queued outbound email, retrying failed messages with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Number of emails sent per connection')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll for new email')
+        parser.add_argument('--interval', type=int, default=POLL_SECONDS, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            total = 0
+            while True:
+                attempted = send_pending_mail(options['batch_size'])
+                if not attempted:
+                    break
+                total += attempted
+
+            self.stdout.write(self.style.SUCCESS(f'Processed {total} queued emails'))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,77 @@
+"""
+Module content manifest: the ordered list of every Content item in a module,
+built from one UNION query over the Content subclass tables and kept in Django's
+cache. Each module has a version counter that is bumped whenever its content
+changes, so stale manifests are simply never read again.
+"""
+from collections import namedtuple, defaultdict
+
+from django.core.cache import cache
+from django.db.models import Value, IntegerField
+from django.contrib.contenttypes.models import ContentType
+
+from returnToWork.cache_versions import bump_versions, get_versions
+from returnToWork.models import CONTENT_MODELS
+
+ManifestEntry = namedtuple('ManifestEntry', ['content_type', 'content_id', 'order_index', 'is_published'])
+
+MANIFEST_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(module_id):
+    return f'module-manifest-version:{module_id}'
+
+
+def _manifest_key(module_id, version):
+    return f'module-manifest:{module_id}:{version}'
+
+
+def get_module_versions(module_ids):
+    """Return {module_id: version} for the cached manifests of the given modules"""
+    versions = get_versions([_version_key(module_id) for module_id in module_ids])
+    return {module_id: versions[_version_key(module_id)] for module_id in module_ids}
+
+
+def bump_module_version(module_id):
+    """Invalidate the cached manifest of a module, now and again once the surrounding transaction commits"""
+    bump_versions(_version_key(module_id))
+
+
+def build_module_manifests(module_ids):
+    """Build manifests for the given modules with a single UNION query"""
+    content_types = ContentType.objects.get_for_models(*CONTENT_MODELS)
+    queries = [
+        model.objects.filter(moduleID__in=module_ids).order_by()
+        .annotate(content_type=Value(content_types[model].id, output_field=IntegerField()))
+        .values_list('moduleID', 'content_type', 'contentID', 'order_index', 'is_published')
+        for model in CONTENT_MODELS
+    ]
+
+    manifests = defaultdict(list)
+    for module_id, content_type, content_id, order_index, is_published in queries[0].union(*queries[1:], all=True).order_by('order_index'):
+        manifests[module_id].append(ManifestEntry(content_type, content_id, order_index, is_published))
+    return {module_id: manifests[module_id] for module_id in module_ids}
+
+
+def get_module_manifests(module_ids):
+    """Return {module_id: [ManifestEntry, ...]} for many modules, building any missing ones in one query"""
+    module_ids = {getattr(module, 'pk', module) for module in module_ids}
+    if not module_ids:
+        return {}
+
+    versions = get_module_versions(module_ids)
+    keys = {_manifest_key(module_id, version): module_id for module_id, version in versions.items()}
+    manifests = {keys[key]: manifest for key, manifest in cache.get_many(keys).items()}
+
+    missing = module_ids - manifests.keys()
+    if missing:
+        built = build_module_manifests(missing)
+        cache.set_many({_manifest_key(module_id, versions[module_id]): built[module_id] for module_id in missing}, MANIFEST_TIMEOUT)
+        manifests.update(built)
+    return manifests
+
+
+def get_module_manifest(module):
+    """Return the ordered manifest of a single module"""
+    module_id = getattr(module, 'pk', module)
+    return get_module_manifests([module_id])[module_id]
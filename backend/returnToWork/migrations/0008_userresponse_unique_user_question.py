@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-17 20:05
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def remove_duplicate_responses(apps, schema_editor):
+    """Keep only the most recent response for each (user, question) pair before it becomes unique"""
+    UserResponse = apps.get_model('returnToWork', 'UserResponse')
+    duplicates = (
+        UserResponse.objects.values('user', 'question')
+        .annotate(count=Count('id'), latest=Max('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        UserResponse.objects.filter(
+            user=duplicate['user'], question=duplicate['question']
+        ).exclude(id=duplicate['latest']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returnToWork', '0007_remove_pageviewsession_module_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_responses, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='userresponse',
+            unique_together={('user', 'question')},
+        ),
+    ]
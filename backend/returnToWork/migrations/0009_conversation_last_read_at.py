@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-17 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returnToWork', '0008_userresponse_unique_user_question'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='admin_last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-17 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returnToWork', '0012_pendingsignup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='audioclip',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='embeddedvideo',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='rankingquestion',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='is_published',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='user_type',
+            field=models.CharField(choices=[('admin', 'Admin'), ('service user', 'Service user'), ('superadmin', 'Super Admin')], db_index=True, max_length=30),
+        ),
+    ]
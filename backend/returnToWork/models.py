@@ -1,15 +1,24 @@
 from django.utils import timezone
 from django.core.validators import RegexValidator , EmailValidator
 from django.contrib.auth.models import AbstractUser,Group,Permission
-from django.db import models
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
 from django.contrib.auth.models import User
 import uuid
 import os
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.db.models import JSONField
-from django.contrib.contenttypes.fields import GenericForeignKey
+from django.db.models import Count, F, Q, Case, When, Value, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce, Greatest, Left
+from django.db.models.lookups import GreaterThan, GreaterThanOrEqual
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from collections import defaultdict
+
+from returnToWork.questionnaire_validation import find_cycle
+from returnToWork.response_cache import invalidate
 
 
 class Questionnaire(models.Model):
@@ -36,40 +45,37 @@ class Questionnaire(models.Model):
 
 
     def clean(self):
-        def is_parent_question(other):
-            """Helper function to test whether a given question is a parent to the current question (DFS)"""
-            
-            # Returns False is other is null
-            if not other:
-                return False
-
-
-            stack = [other]
-            
-            while stack:
-                head = stack[-1]
-                stack = stack[:-1]
-
-                if head == self:
-                    return True      
-                      
-                left_child = head.yes_next_q
-                right_child = head.no_next_q
-
-                if left_child:
-                    stack.append(left_child)
-                if right_child:
-                    stack.append(right_child)
-    
-            return False
-
-        def has_circular_references():
-            return is_parent_question(self.yes_next_q) or is_parent_question(self.no_next_q)
-
-
-
-        if has_circular_references():
-            raise ValidationError("You cannot reference an ancestor question in a descendant question")
+        # Every saved edge in one query, overlaid with this question's proposed edges and any
+        # unsaved questions it links to, then checked for a cycle through this question
+        edges = {
+            pk: (yes_id, no_id)
+            for pk, yes_id, no_id in Questionnaire.objects.values_list('id', 'yes_next_q', 'no_next_q')
+        }
+        pending = [self]
+        seen = set()
+        while pending:
+            question = pending.pop()
+            if id(question) in seen:
+                continue
+            seen.add(id(question))
+            # Saved children are followed through their ids; only unsaved ones need the cached instance
+            unsaved = [question._state.fields_cache.get(name) for name in ('yes_next_q', 'no_next_q')]
+            unsaved = [child if child is not None and child.pk is None else None for child in unsaved]
+            edges[self._graph_key(question)] = (
+                self._graph_key(unsaved[0]) if unsaved[0] else question.yes_next_q_id,
+                self._graph_key(unsaved[1]) if unsaved[1] else question.no_next_q_id,
+            )
+            pending.extend(child for child in unsaved if child)
+
+        cycle = find_cycle(edges, start=self._graph_key(self))
+        if cycle:
+            path = " -> ".join(str(node) if not isinstance(node, tuple) else "new question" for node in cycle)
+            raise ValidationError(f"You cannot reference an ancestor question in a descendant question ({path})")
+
+    @staticmethod
+    def _graph_key(question):
+        """Saved questions are keyed by id, unsaved ones by object identity"""
+        return question.pk if question.pk is not None else ('unsaved', id(question))
 
     def __str__(self):
         return f"-- {self.question}\n\t|YES|: {self.yes_next_q.question if self.yes_next_q else None}\n\t|NO|: {self.no_next_q.question if self.no_next_q else None}\n"
@@ -84,12 +90,23 @@ class Module(models.Model):
     upvotes = models.PositiveIntegerField(default=0) 
 
     def upvote(self):
-        self.upvotes += 1
-        self.save()
+        self._shift_upvotes(1)
 
     def downvote(self):
-        self.upvotes -= 1
-        self.save()
+        self._shift_upvotes(-1)
+
+    def _shift_upvotes(self, delta):
+        """
+        Move the counter in the database with a single UPDATE so concurrent votes are never lost,
+        without re-saving (and re-titlecasing) the rest of the row. Never drops below zero.
+        """
+        modules = Module.objects.filter(pk=self.pk)
+        if delta < 0:
+            modules = modules.filter(upvotes__gte=-delta)
+        if modules.update(upvotes=F('upvotes') + delta):
+            # queryset updates skip the post_save signal that normally expires cached module lists
+            invalidate('modules', 'tags')
+        self.refresh_from_db(fields=['upvotes'])
 
     def save(self, *args, **kwargs):
         self.title = self.title.title()  
@@ -146,6 +163,7 @@ class User(AbstractUser):
         choices=USER_TYPE_CHOICES,
         blank=False,
         null=False,
+        db_index=True,
     )
 
     username = models.CharField(
@@ -193,6 +211,59 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.full_name()} - {self.username} - {self.user_id}"
 
+class PendingSignup(models.Model):
+    """Sign-up waiting for email verification, stored in the database so any worker or node can verify it"""
+    token = models.CharField(max_length=64, unique=True)
+    email = models.EmailField()
+    user_data = JSONField(default=dict)  # profile fields for create_user, without the password
+    password = models.CharField(max_length=128)  # already hashed, never stored in plain text
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    TTL = timezone.timedelta(days=1)
+
+    def __str__(self):
+        return f"Pending sign-up for {self.email}"
+
+    @classmethod
+    def create_for(cls, user_data):
+        """Store validated sign-up data under a new verification token"""
+        user_data = dict(user_data)
+        password = make_password(user_data.pop('password'))
+        return cls.objects.create(
+            token=str(uuid.uuid4()),
+            email=user_data['email'],
+            user_data=user_data,
+            password=password,
+            expires_at=timezone.now() + cls.TTL
+        )
+
+    @classmethod
+    def get_valid(cls, token):
+        """Return the unexpired sign-up for a token, or None"""
+        return cls.objects.filter(token=token, expires_at__gt=timezone.now()).first()
+
+    @classmethod
+    def purge_expired(cls):
+        """Delete every expired sign-up in one statement and return how many were removed"""
+        return cls.objects.filter(expires_at__lte=timezone.now()).delete()[0]
+
+    def create_user(self):
+        """
+        Create the verified user with the stored password hash and discard this sign-up.
+        The row is deleted first in the same transaction, so when the link is used twice at once
+        only the request that deleted it creates the user; the other gets None
+        """
+        with transaction.atomic():
+            deleted, _ = PendingSignup.objects.filter(pk=self.pk).delete()
+            if not deleted:
+                return None
+            user = User.objects.create_user(password=None, **self.user_data)
+            user.password = self.password
+            user.save(update_fields=['password'])
+        return user
+
+
 # adding this since the implementation now is ONLY superadmin is allowed to create admin (admin cant simply sign up using the signup page)
 # so this separates verification data --> to avoid redundancy since service user and superadmin dont need this
 class AdminVerification(models.Model):
@@ -230,36 +301,47 @@ class ProgressTracker(models.Model):
     class Meta:
         unique_together = ('user', 'module')
     
-    def update_progress(self):
-        """Recalculate progress for this module"""
-        # Get ContentType for each model
-        content_models = [Document, EmbeddedVideo, Task, Document, Image,AudioClip, RankingQuestion]
-        content_types = [ContentType.objects.get_for_model(model) for model in content_models]
-        
-        # Count total contents
-        total_count = 0
-        for model in content_models:
-            total_count += model.objects.filter(moduleID=self.module).count()
-        
-        self.total_contents = total_count
-
-        # Count viewed contents
-        viewed_count = 0
-        for model, content_type in zip(content_models, content_types):
-            # Get all IDs of this content type in this module
-            content_ids = model.objects.filter(moduleID=self.module).values_list('contentID', flat=True)
-            
-            # Count viewed contents
-            if content_ids:
-                viewed = ContentProgress.objects.filter(
-                    user=self.user,
-                    content_type=content_type,
-                    object_id__in=content_ids,
-                    viewed=True
-                ).count()
-                viewed_count += viewed
-
-        self.contents_completed = viewed_count
+    @staticmethod
+    def count_progress(pairs):
+        """
+        Count total and viewed contents for many (user, module) pairs at once.
+        Totals come from the module manifests and viewed counts from one aggregate UNION query
+        over every Content subclass table, no matter how many pairs are given.
+        Returns a dict of (user_id, module_id) -> (total_contents, contents_completed)
+        """
+        pairs = {(getattr(user, 'pk', user), getattr(module, 'pk', module)) for user, module in pairs}
+        if not pairs:
+            return {}
+
+        user_ids = {user_id for user_id, _ in pairs}
+        module_ids = {module_id for _, module_id in pairs}
+
+        # Total contents per module, read from the cached module manifests
+        from returnToWork.manifest import get_module_manifests
+        totals = {module_id: len(manifest) for module_id, manifest in get_module_manifests(module_ids).items()}
+
+        # Viewed contents per (user, module), joined through the ContentProgress generic relation
+        viewed = defaultdict(int)
+        viewed_queries = [
+            model.objects.filter(
+                moduleID__in=module_ids,
+                progress_records__user__in=user_ids,
+                progress_records__viewed=True
+            ).order_by().values_list('moduleID', 'progress_records__user').annotate(count=Count('pk'))
+            for model in CONTENT_MODELS
+        ]
+        for module_id, user_id, count in viewed_queries[0].union(*viewed_queries[1:], all=True):
+            viewed[(user_id, module_id)] += count
+
+        return {
+            (user_id, module_id): (totals[module_id], viewed[(user_id, module_id)])
+            for user_id, module_id in pairs
+        }
+
+    def apply_counts(self, total_contents, contents_completed):
+        """Set the progress fields from a (total, viewed) count without saving"""
+        self.total_contents = total_contents
+        self.contents_completed = contents_completed
 
         # Calculate percentage
         if self.total_contents > 0:
@@ -270,9 +352,98 @@ class ProgressTracker(models.Model):
         # Mark as completed if all items are viewed
         if self.contents_completed == self.total_contents and self.total_contents > 0:
             self.completed = True
-        
+
+    @classmethod
+    def recompute(cls, pairs):
+        """
+        Recalculate progress for many (user, module) pairs in a fixed number of queries.
+        Missing trackers are created. Returns the updated trackers
+        """
+        counts = cls.count_progress(pairs)
+        if not counts:
+            return []
+
+        user_ids = {user_id for user_id, _ in counts}
+        module_ids = {module_id for _, module_id in counts}
+        trackers = {
+            (tracker.user_id, tracker.module_id): tracker
+            for tracker in cls.objects.filter(user__in=user_ids, module__in=module_ids)
+            if (tracker.user_id, tracker.module_id) in counts
+        }
+
+        missing = [cls(user_id=user_id, module_id=module_id) for user_id, module_id in counts if (user_id, module_id) not in trackers]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            for tracker in cls.objects.filter(user__in=user_ids, module__in=module_ids):
+                trackers.setdefault((tracker.user_id, tracker.module_id), tracker)
+
+        updated = []
+        for key, (total, viewed) in counts.items():
+            tracker = trackers.get(key)
+            if tracker:
+                tracker.apply_counts(total, viewed)
+                updated.append(tracker)
+
+        cls.objects.bulk_update(updated, ['total_contents', 'contents_completed', 'progress_percentage', 'completed'])
+        return updated
+
+    def update_progress(self):
+        """Recalculate progress for this module (full recount, used to initialise or repair a tracker)"""
+        total, viewed = self.count_progress([(self.user_id, self.module_id)])[(self.user_id, self.module_id)]
+        self.apply_counts(total, viewed)
         self.save()
 
+    @staticmethod
+    def shift_counts(trackers, completed_delta=0, total_delta=0):
+        """
+        Atomically adjust the counters of every tracker in the queryset with F() expressions.
+        progress_percentage and completed are derived in the same UPDATE
+        """
+        completed = Greatest(F('contents_completed') + completed_delta, Value(0))
+        total = Greatest(F('total_contents') + total_delta, Value(0))
+        has_contents = GreaterThan(total, 0)
+
+        return trackers.update(
+            contents_completed=completed,
+            total_contents=total,
+            progress_percentage=Case(
+                When(has_contents, then=Cast(completed, FloatField()) * 100 / total),
+                default=Value(0.0),
+                output_field=FloatField()
+            ),
+            # Mark as completed if all items are viewed
+            completed=Case(
+                When(has_contents & GreaterThanOrEqual(completed, total), then=Value(True)),
+                default=F('completed')
+            )
+        )
+
+    @classmethod
+    def get_or_create_initialised(cls, user, module, defaults=None):
+        """get_or_create that runs a full recount on the tracker it creates, so its counters start correct"""
+        tracker, created = cls.objects.get_or_create(user=user, module_id=getattr(module, 'pk', module), defaults=defaults)
+        if created:
+            tracker.update_progress()
+        return tracker, created
+
+    @classmethod
+    def record_view(cls, user, module, newly_viewed=True):
+        """
+        Return the tracker for a viewed content item. contents_completed is only incremented when the
+        item has just flipped to viewed; new trackers, and older ones that were never counted, get a full recount
+        """
+        tracker, created = cls.get_or_create_initialised(user, module)
+        if created:
+            return tracker
+
+        if tracker.total_contents == 0:
+            # a module with a viewed item has at least one item, so this tracker was never counted
+            tracker.update_progress()
+        elif newly_viewed:
+            cls.shift_counts(cls.objects.filter(pk=tracker.pk), completed_delta=1)
+            tracker.refresh_from_db(fields=['contents_completed', 'total_contents', 'progress_percentage', 'completed'])
+        return tracker
+
     def __str__(self):
         return f"{self.user.username} - {self.module.title} - {'Completed' if self.completed else 'Incomplete'}"
 
@@ -297,8 +468,9 @@ class Content(models.Model):
     description = models.TextField(blank=True, null=True)
     created_at=models.DateTimeField(auto_now_add=True)
     updated_at=models.DateTimeField(auto_now=True)
-    is_published= models.BooleanField(default=False)
+    is_published= models.BooleanField(default=False, db_index=True)
     order_index = models.IntegerField(default=0)  # to store order
+    progress_records = GenericRelation('ContentProgress', content_type_field='content_type', object_id_field='object_id')
 
     class Meta:
         abstract = True  # No separate table for Content Model, only the subclasses will have database tables
@@ -447,6 +619,10 @@ class Task(Content):
         return f"{self.title} ({self.get_quiz_type_display()})"
 
 
+# Every concrete Content subclass, used wherever all content tables of a module are queried together
+CONTENT_MODELS = (Document, EmbeddedVideo, Task, Image, AudioClip, RankingQuestion)
+
+
 # QuizQuestion stores the individual questions
 class QuizQuestion(models.Model):
     """
@@ -480,6 +656,7 @@ class UserResponse(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        unique_together = ('user', 'question')
 
     def __str__(self):
         return f"Response by {self.user.username} for {self.question}"
@@ -492,10 +669,49 @@ class Conversation(models.Model): #one-to-many relationship with Messages
     updated_at = models.DateTimeField(auto_now=True)
     hasEngaged = models.BooleanField(default=False)
     lastMessage = models.TextField(default="")
+    # When each side last opened the chat, used to count unread messages
+    user_last_read_at = models.DateTimeField(null=True, blank=True)
+    admin_last_read_at = models.DateTimeField(null=True, blank=True)
+
+    PREVIEW_LENGTH = 100
 
     def __str__(self):
         return f"Conversation created for: {self.user} and {self.admin}"
 
+    @staticmethod
+    def last_read_field(user):
+        """The last-read column for the side of the chat this user is on"""
+        return 'user_last_read_at' if user.user_type == 'service user' else 'admin_last_read_at'
+
+    @classmethod
+    def inbox_for(cls, user):
+        """Conversations visible to the user, annotated with the owner's username, unread count and last message"""
+        if user.user_type == 'service user':
+            conversations = cls.objects.filter(user=user)
+        else:
+            conversations = cls.objects.filter(Q(hasEngaged=False) | Q(admin=user))
+
+        messages = Message.objects.filter(conversation=OuterRef('pk')).order_by()
+        unread = (
+            messages.exclude(sender=user)
+            .filter(timestamp__gt=Coalesce(OuterRef(cls.last_read_field(user)), OuterRef('created_at')))
+            .values('conversation')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        latest = messages.order_by('-timestamp', '-id')
+
+        return conversations.annotate(
+            user_username=F('user__username'),
+            unread_count=Coalesce(Subquery(unread), 0),
+            last_message_preview=Subquery(latest.annotate(preview=Left('text_content', cls.PREVIEW_LENGTH)).values('preview')[:1]),
+            last_message_at=Subquery(latest.values('timestamp')[:1]),
+        )
+
+    def mark_read(self, user):
+        """Record that the user has seen every message so far, without touching updated_at"""
+        Conversation.objects.filter(pk=self.pk).update(**{self.last_read_field(user): timezone.now()})
+
 
 class Message(models.Model):    
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE)
@@ -504,6 +720,11 @@ class Message(models.Model):
     timestamp =  models.DateTimeField(auto_now_add=True)
     file = models.FileField(upload_to="message-files/", null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['conversation', 'timestamp'], name='message_conversation_time_idx'),
+        ]
+
     def __str__(self):
         return f"Text sent: {self.text_content}"
             
@@ -527,19 +748,31 @@ class ContentProgress(models.Model):
     
     class Meta:
         unique_together = ('user', 'content_type', 'object_id')
+
+    @staticmethod
+    def with_content_objects(queryset):
+        """Prefetch content_object (and its module) for every row, with one query per content type instead of two per row"""
+        return queryset.prefetch_related(
+            GenericPrefetch('content_object', [model.objects.select_related('moduleID') for model in CONTENT_MODELS])
+        )
     
     def mark_as_viewed(self):
-        self.viewed = True
+        """Mark as viewed and update the module progress, returning the module's ProgressTracker"""
         self.viewed_at = timezone.now()
-        self.save()
-        
+
+        # Conditional update so only the request that flips the row to viewed bumps the counter
+        if self.pk:
+            newly_viewed = ContentProgress.objects.filter(pk=self.pk, viewed=False).update(
+                viewed=True, viewed_at=self.viewed_at
+            ) == 1
+            self.viewed = True
+        else:
+            self.viewed = True
+            self.save()
+            newly_viewed = True
+
         # Update the module progress after marking content as viewed
-        module = self.content_object.moduleID
-        progress, created = ProgressTracker.objects.get_or_create(
-            user=self.user,
-            module=module
-        )
-        progress.update_progress()
+        return ProgressTracker.record_view(self.user, self.content_object.moduleID_id, newly_viewed)
     
     def __str__(self):
         return f"{self.user.username} - {self.content_type} - {self.object_id}"
@@ -558,3 +791,32 @@ class TermsAndConditions(models.Model):
     
     def __str__(self):
         return f"Terms and Conditions (Updated: {self.updated_at.strftime('%Y-%m-%d')})"
+
+
+class OutgoingEmail(models.Model):
+    """Email waiting to be sent by the outbox worker, so requests never block on SMTP"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=36, blank=True, default='', db_index=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outgoing_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipients)} ({self.status})"
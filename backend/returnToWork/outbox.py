@@ -0,0 +1,135 @@
+"""
+Outbound email queue. queue_mail() stores a message in the OutgoingEmail table and, once
+the transaction commits, wakes a background thread that sends everything due over one
+SMTP connection per batch. Failed messages are retried with exponential backoff. With
+EMAIL_OUTBOX_WORKER = 'command', delivery is left to `manage.py send_queued_mail`.
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from returnToWork.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+CLAIM_SECONDS = 300
+POLL_SECONDS = 60
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Drop-in replacement for send_mail that returns as soon as the message is stored"""
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list)
+    )
+    if getattr(settings, 'EMAIL_OUTBOX_WORKER', 'thread') == 'thread':
+        transaction.on_commit(worker.wake)
+    return email
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def record_failures(failures):
+    """Schedule a retry with backoff for each (email, error), giving up after MAX_ATTEMPTS"""
+    now = timezone.now()
+    for email, error in failures:
+        email.attempts += 1
+        email.status = 'failed' if email.attempts >= MAX_ATTEMPTS else 'pending'
+        email.next_attempt_at = now + retry_delay(email.attempts)
+        email.last_error = str(error)
+        email.claim_token = ''
+        if email.status == 'failed':
+            # never sent again, so drop the body and the reset or verification link in it
+            email.body = ''
+    OutgoingEmail.objects.bulk_update(
+        [email for email, _ in failures],
+        ['attempts', 'status', 'next_attempt_at', 'last_error', 'claim_token', 'body']
+    )
+
+
+def send_pending_mail(batch_size=BATCH_SIZE):
+    """Send one batch of due emails over a single connection and return how many were attempted"""
+    now = timezone.now()
+    token = str(uuid.uuid4())
+    due = list(
+        OutgoingEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+
+    # Claim the batch so a concurrent worker skips it; a claim that is never finished expires and the rows become due again
+    OutgoingEmail.objects.filter(id__in=due, status='pending', next_attempt_at__lte=now).update(
+        claim_token=token, next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+    )
+    emails = list(OutgoingEmail.objects.filter(claim_token=token).order_by('id'))
+    if not emails:
+        return 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        logger.exception("Could not open the email connection")
+        record_failures([(email, error) for email in emails])
+        return len(emails)
+
+    sent, failures = [], []
+    try:
+        for email in emails:
+            try:
+                EmailMessage(email.subject, email.body, email.from_email, email.recipients, connection=connection).send()
+                sent.append(email.id)
+            except Exception as error:
+                failures.append((email, error))
+    finally:
+        connection.close()
+
+    # bodies carry live password reset and verification links, so they are not kept once delivered
+    OutgoingEmail.objects.filter(id__in=sent).update(status='sent', sent_at=timezone.now(), claim_token='', last_error='', body='')
+    if failures:
+        record_failures(failures)
+    return len(emails)
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox after each commit and polls for retries"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def wake(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='email-outbox', daemon=True)
+                self.thread.start()
+        self.event.set()
+
+    def run(self):
+        while True:
+            self.event.wait(POLL_SECONDS)
+            self.event.clear()
+            try:
+                while send_pending_mail():
+                    pass
+            except Exception:
+                logger.exception("Sending queued email failed")
+            finally:
+                connections.close_all()
+
+
+worker = OutboxWorker()
@@ -0,0 +1,54 @@
+from django.conf import settings
+
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class QuizResponseCursorPagination(CursorPagination):
+    """Pages quiz responses oldest first, so new submissions never shift rows already paged through; only applied when ?limit= is given"""
+    ordering = ('submitted_at', 'id')
+    page_size = None
+    page_size_query_param = 'limit'
+    max_page_size = 2000
+
+
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    """Only paginates when ?limit= is given, so existing clients keep receiving a plain list"""
+    default_limit = None
+    max_limit = 100
+
+
+class ConversationCursorPagination(CursorPagination):
+    """Keyset pagination over the support inbox, newest activity first; only applied when ?limit= is given"""
+    ordering = ('-updated_at', '-id')
+    page_size = None
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class MessageCursorPagination(CursorPagination):
+    """Pages back through a chat from the newest message; only applied when ?limit= is given"""
+    ordering = ('-timestamp', '-id')
+    page_size = None
+    page_size_query_param = 'limit'
+    max_page_size = 200
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Project-wide pagination for list endpoints. Pages are API_PAGE_SIZE rows unless the
+    client asks for ?limit=; with no API_PAGE_SIZE set, only requests with ?limit= are
+    paginated. Views choose a stable order with `cursor_ordering`, and small lookup
+    tables opt out with `pagination_class = None`.
+    """
+    ordering = ('-pk',)
+    page_size_query_param = 'limit'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class ModuleFeedPagination(LimitOffsetPagination):
+    """Pages the ranked module feed, which is a cached list rather than a queryset, so it always pages"""
+    default_limit = 20
+    max_limit = settings.API_MAX_PAGE_SIZE
@@ -0,0 +1,76 @@
+"""
+The questionnaire decision tree compiled into an immutable in-process snapshot: every node
+loaded with one query into a dict of id -> QuestionNode, with the root found as the node
+no other question points at. Snapshots are tagged with the 'questionnaire' response cache
+version, which is bumped whenever a question changes, so every process reloads after an
+edit while answering each yes/no step with memory lookups only.
+"""
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from returnToWork.models import Questionnaire
+from returnToWork.response_cache import get_group_version
+
+# Field names match QuestionnaireSerializer, so node._asdict() is the API representation
+QuestionNode = namedtuple('QuestionNode', ['id', 'question', 'yes_next_q', 'no_next_q'])
+
+CACHE_GROUP = 'questionnaire'
+
+
+def find_root(nodes):
+    """Return the id of the question nothing points at, preferring the lowest id if stray questions exist"""
+    children = set()
+    for node in nodes.values():
+        children.update((node.yes_next_q, node.no_next_q))
+    roots = [node_id for node_id in nodes if node_id not in children]
+    return min(roots) if roots else None
+
+
+class QuestionnaireTree:
+    def __init__(self, nodes, version):
+        self.nodes = MappingProxyType(nodes)
+        self.root_id = find_root(nodes)
+        self.version = version
+
+    @classmethod
+    def load(cls, version):
+        rows = Questionnaire.objects.values_list('id', 'question', 'yes_next_q', 'no_next_q')
+        return cls({row[0]: QuestionNode(*row) for row in rows}, version)
+
+    def get(self, question_id):
+        return self.nodes.get(question_id)
+
+    @property
+    def root(self):
+        return self.nodes.get(self.root_id)
+
+    def next_question(self, question_id, answer):
+        """Follow the yes or no edge of a question; None at the end of the questionnaire"""
+        node = self.nodes[question_id]
+        return self.nodes.get(node.yes_next_q if answer == 'yes' else node.no_next_q)
+
+    def as_dict(self):
+        return {
+            'version': self.version,
+            'root': self.root_id,
+            'questions': [node._asdict() for node in self.nodes.values()],
+        }
+
+
+_tree = None
+_tree_lock = threading.Lock()
+
+
+def get_questionnaire_tree():
+    """Return the compiled tree, rebuilding it once per process after the questionnaire changes"""
+    global _tree
+    version = get_group_version(CACHE_GROUP)
+    tree = _tree
+    if tree is not None and tree.version == version:
+        return tree
+
+    with _tree_lock:
+        if _tree is None or _tree.version != version:
+            _tree = QuestionnaireTree.load(version)
+        return _tree
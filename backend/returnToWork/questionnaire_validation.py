@@ -0,0 +1,79 @@
+"""
+Cycle detection for the questionnaire decision tree. The graph is given as a plain mapping of
+question -> (yes_next_q, no_next_q), so it can be built from one values_list query or from a
+proposed payload before anything is written. Uses an iterative coloured DFS: every node and
+edge is visited once, and the offending path is returned when a back edge is found.
+"""
+
+WHITE, GREY, BLACK = 0, 1, 2
+_DONE = object()
+
+
+def find_cycle(edges, start=None):
+    """
+    Return a list of nodes forming a cycle, starting and ending with the same node, or None.
+    Children that are None or missing from edges are treated as leaves. If start is given,
+    only the part of the graph reachable from it is checked.
+    """
+    colour = dict.fromkeys(edges, WHITE)
+    roots = [start] if start is not None else list(edges)
+
+    for root in roots:
+        if root not in edges or colour[root] != WHITE:
+            continue
+
+        colour[root] = GREY
+        path = [root]
+        stack = [iter(edges[root])]
+        while stack:
+            child = next(stack[-1], _DONE)
+            if child is _DONE:
+                colour[path.pop()] = BLACK
+                stack.pop()
+            elif child not in edges:
+                continue
+            elif colour[child] == GREY:
+                return path[path.index(child):] + [child]
+            elif colour[child] == WHITE:
+                colour[child] = GREY
+                path.append(child)
+                stack.append(iter(edges[child]))
+    return None
+
+
+def parse_questions(questions):
+    """
+    Turn question dicts as sent to QuestionnaireView into {id: (question, yes_next_q, no_next_q)}.
+    Returns (nodes, None), or (None, error message) if the payload is malformed.
+    """
+    if not isinstance(questions, list):
+        return None, "questions must be a list"
+
+    nodes = {}
+    for question in questions:
+        if not isinstance(question, dict):
+            return None, "Every question must be an object"
+        question_id = question.get('id')
+        if not isinstance(question_id, int) or isinstance(question_id, bool):
+            return None, "Every question needs an integer id"
+        if question_id in nodes:
+            return None, f"Question {question_id} appears more than once"
+        text = question.get('question')
+        if not isinstance(text, str) or not text.strip():
+            return None, f"Question {question_id} has no text"
+        nodes[question_id] = (text, question.get('yes_next_q'), question.get('no_next_q'))
+    return nodes, None
+
+
+def validate_graph(nodes):
+    """Return an error body if a question links to a missing question or loops back on itself, else None"""
+    edges = {question_id: (yes_id, no_id) for question_id, (_, yes_id, no_id) in nodes.items()}
+
+    missing = sorted({child for children in edges.values() for child in children if child is not None} - edges.keys(), key=str)
+    if missing:
+        return {"error": "Next question not found", "missing": missing}
+
+    cycle = find_cycle(edges)
+    if cycle:
+        return {"error": "You cannot reference an ancestor question in a descendant question", "cycle": cycle}
+    return None
@@ -0,0 +1,167 @@
+"""
+Realtime fan-out for chat events. Views call publish(), which queues the event once the
+surrounding transaction commits; a background thread drains the queue in batches and
+hands them to the backend chosen by settings.REALTIME_BACKEND:
+
+    'pusher' - Pusher Channels, through one client reused across requests
+    'sse'    - an in-process broker read by UserChatEventsView as server-sent events
+    'local'  - keeps published events in memory, for tests and local development
+"""
+import json
+import logging
+import queue
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+import pusher
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10  # Pusher accepts at most 10 events per batch call
+KEEPALIVE_SECONDS = 15
+
+
+class PusherBackend:
+    def __init__(self):
+        self.client = pusher.Pusher(
+            app_id=settings.PUSHER_APP_ID,
+            key=settings.PUSHER_KEY,
+            secret=settings.PUSHER_SECRET,
+            cluster=settings.PUSHER_CLUSTER,
+            ssl=True
+        )
+
+    def publish_batch(self, events):
+        if len(events) == 1:
+            channel, event, data = events[0]
+            self.client.trigger(channel, event, data)
+        else:
+            self.client.trigger_batch([{'channel': channel, 'name': event, 'data': data} for channel, event, data in events])
+
+
+class LocalBackend:
+    def __init__(self):
+        self.events = []
+
+    def publish_batch(self, events):
+        self.events.extend(events)
+
+
+class ServerSentEventsBackend:
+    """Delivers events to clients of this process only, so run a single web process or use the Pusher backend"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscriber = queue.Queue()
+        with self.lock:
+            self.subscribers[channel].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self.lock:
+            self.subscribers[channel].discard(subscriber)
+            if not self.subscribers[channel]:
+                del self.subscribers[channel]
+
+    def publish_batch(self, events):
+        with self.lock:
+            for channel, event, data in events:
+                for subscriber in self.subscribers.get(channel, ()):
+                    subscriber.put(f"event: {event}\ndata: {json.dumps(data)}\n\n")
+
+
+BACKENDS = {
+    'pusher': PusherBackend,
+    'sse': ServerSentEventsBackend,
+    'local': LocalBackend,
+}
+
+
+class Publisher:
+    """Background worker that sends queued events to the backend in batches, off the request path"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def enqueue(self, channel, event, data):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='realtime-publisher', daemon=True)
+                self.thread.start()
+        self.queue.put((channel, event, data))
+
+    def run(self):
+        while True:
+            events = [self.queue.get()]
+            while len(events) < BATCH_SIZE:
+                try:
+                    events.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.backend.publish_batch(events)
+            except Exception:
+                logger.exception("Publishing %d realtime events failed", len(events))
+            finally:
+                for _ in events:
+                    self.queue.task_done()
+
+    def flush(self):
+        """Block until every queued event has been handed to the backend"""
+        self.queue.join()
+
+
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher():
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = Publisher(BACKENDS[settings.REALTIME_BACKEND]())
+    return _publisher
+
+
+@receiver(setting_changed)
+def reset_publisher(setting, **kwargs):
+    """Pick up a new backend when tests override the realtime settings"""
+    global _publisher
+    if setting == 'REALTIME_BACKEND' or setting.startswith('PUSHER_'):
+        with _publisher_lock:
+            _publisher = None
+
+
+def publish(channel, event, data):
+    """Queue an event for delivery once the current transaction commits"""
+    transaction.on_commit(lambda: get_publisher().enqueue(channel, event, data))
+
+
+def chat_channel(room_id):
+    return f"chat-room-{room_id}"
+
+
+def stream_events(backend, channel):
+    """Yield server-sent events for one channel until the client disconnects"""
+    subscriber = backend.subscribe(channel)
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                yield subscriber.get(timeout=KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+    finally:
+        backend.unsubscribe(channel, subscriber)
@@ -0,0 +1,58 @@
+"""
+Response caching for read-mostly endpoints. Cached bodies are grouped ('modules', 'tags', ...)
+and every group has a version counter in the cache; signals bump the version whenever a
+model behind the group changes, so stale responses are simply never read again.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from returnToWork.cache_versions import bump_versions, get_version
+
+
+def _version_key(group):
+    return f'response-cache-version:{group}'
+
+
+def get_group_version(group):
+    return get_version(_version_key(group))
+
+
+def invalidate(*groups):
+    """Make every cached response in the given groups stale, now and again once the surrounding transaction commits"""
+    bump_versions(*(_version_key(group) for group in groups))
+
+
+def response_cache_key(group, request, per_user=False):
+    user_part = request.user.pk if per_user and request.user.is_authenticated else 'all'
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'response-cache:{group}:{get_group_version(group)}:{user_part}:{path}'
+
+
+def cache_response(group, per_user=False, timeout=None):
+    """
+    Cache a successful GET response body under the group. Use per_user=True when the
+    body depends on who is asking; otherwise one copy is shared by every caller.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True) or request.method not in ('GET', 'HEAD'):
+                return view_method(self, request, *args, **kwargs)
+
+            key = response_cache_key(group, request, per_user)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -2,13 +2,12 @@ from rest_framework import serializers
 from django.core.files.base import ContentFile
 import uuid
 import base64
-from .models import ProgressTracker,Tags,User,Module,Content,Task, Questionnaire,  RankingQuestion, Document, EmbeddedVideo, AudioClip, UserModuleInteraction, QuizQuestion,UserResponse, Conversation, Message, AdminVerification, Image
+from .models import ProgressTracker,Tags,User,Module,Content,Task, Questionnaire,  RankingQuestion, Document, EmbeddedVideo, AudioClip, UserModuleInteraction, QuizQuestion,UserResponse, Conversation, Message, AdminVerification, Image, PendingSignup
+from .outbox import queue_mail
 from django.contrib.auth import authenticate, get_user_model
-from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
-from django.core.cache import cache  
 from django.conf import settings
 import uuid
 import ssl
@@ -29,6 +28,13 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tags
         fields = ['id','tag','modules']
 
+def admin_is_verified(user):
+    """Read the verification through the reverse one-to-one, which select_related('verification') has already loaded"""
+    try:
+        return user.verification.is_verified
+    except AdminVerification.DoesNotExist:
+        return False
+
 class AdminUserSerializer(serializers.ModelSerializer):
     is_verified = serializers.SerializerMethodField()
 
@@ -36,14 +42,15 @@ class AdminUserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'user_type', 'is_verified']
 
+    @staticmethod
+    def eager_load(queryset):
+        """Load what the serializer reads in one query, however many users are listed"""
+        return queryset.select_related('verification')
+
     def get_is_verified(self, obj):
         if obj.user_type == 'superadmin':
             return True
-        try:
-            verification = AdminVerification.objects.get(admin=obj)
-            return verification.is_verified
-        except AdminVerification.DoesNotExist:
-            return False
+        return admin_is_verified(obj)
 
 class UserSerializer(serializers.ModelSerializer):
     tags = serializers.SlugRelatedField( #Ensures tags are serialized as a list of tag names rather than ID
@@ -62,17 +69,17 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'user_id', 'username', 'first_name', 'last_name', 'user_type', 'email', 'date_joined', 'module', 'tags',
                    'firebase_token', 'terms_accepted', 'is_verified', 'is_first_login']
 
+    @staticmethod
+    def eager_load(queryset):
+        """Load what the serializer reads in a fixed number of queries, however many users are listed"""
+        return queryset.select_related('verification').prefetch_related('tags', 'module__tags')
+
     def get_is_verified(self, obj):
         """Get verification status from AdminVerification model"""
         # Only check verification for ADMIN users
         if obj.user_type != 'admin':
             return None
-            
-        try:
-            verification = AdminVerification.objects.get(admin=obj)
-            return verification.is_verified
-        except AdminVerification.DoesNotExist:
-            return False
+        return admin_is_verified(obj)
 
 class LogInSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -117,16 +124,14 @@ class SignUpSerializer(serializers.ModelSerializer):
     def create(self,validated_data):
         validated_data.pop("confirm_password")
         validated_data["user_type"] = "service user"
-        verification_token = str(uuid.uuid4())
-        cache.set(verification_token, validated_data, timeout=86400)
-        verification_url = f"http://localhost:5173/verify-email/{verification_token}/"
+        pending_signup = PendingSignup.create_for(validated_data)
+        verification_url = f"http://localhost:5173/verify-email/{pending_signup.token}/"
 
-        send_mail(
+        queue_mail(
             subject= "Verify email",
             message = f"Dear {validated_data['username']}, Thank you for signing up! Please verify your email by clicking the following link: {verification_url}",
             from_email = "readiness.to.return.to.work@gmail.com",
             recipient_list=[validated_data['email']],
-            fail_silently=False,
         )
         return validated_data
 
@@ -425,6 +430,22 @@ class EmbeddedVideoSerializer(ContentSerializer):
             except Exception as e:
                 raise serializers.ValidationError(f"Invalid URL: {str(e)}")
 
+class ContentAuthorSerializer(serializers.ModelSerializer):
+    """Basic author details nested in module content listings, readable from a select_related author"""
+    class Meta:
+        model = User
+        fields = ['id', 'user_id', 'username', 'first_name', 'last_name']
+
+def module_content_serializer(serializer_class):
+    """Variant of a content serializer that nests ContentAuthorSerializer instead of the full UserSerializer"""
+    class ModuleContentSerializer(serializer_class):
+        author = ContentAuthorSerializer(read_only=True)
+
+        class Meta(serializer_class.Meta):
+            fields = list(dict.fromkeys(serializer_class.Meta.fields + ['author', 'order_index']))
+
+    return ModuleContentSerializer
+
 class ContentPublishSerializer(serializers.Serializer):
     """Serializer to handle module and content creation"""
     title = serializers.CharField(max_length=255)
@@ -532,12 +553,11 @@ class RequestPasswordResetSerializer(serializers.Serializer):
             reset_url = f"http://localhost:5173/password-reset/{uidb64}/{token}/"
 
 
-            send_mail(
+            queue_mail(
                 subject= "Password reset",
                 message = f"Click the link to reset your password: {reset_url}",
                 from_email = "readiness.to.return.to.work@gmail.com",
                 recipient_list=[email],
-                fail_silently=False,
             )
         
             return user
@@ -554,6 +574,17 @@ class ConversationSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'admin', 'created_at', 'hasEngaged', 'updated_at','lastMessage']
 
 
+class ConversationListSerializer(ConversationSerializer):
+    """Inbox row; the extra fields are annotations added by Conversation.inbox_for()"""
+    user_username = serializers.CharField(read_only=True)
+    unread_count = serializers.IntegerField(read_only=True)
+    last_message_preview = serializers.CharField(read_only=True, allow_null=True)
+    last_message_at = serializers.DateTimeField(read_only=True, allow_null=True)
+
+    class Meta(ConversationSerializer.Meta):
+        fields = ConversationSerializer.Meta.fields + ['user_username', 'unread_count', 'last_message_preview', 'last_message_at']
+
+
 class MessageSerializer(serializers.ModelSerializer):
 
     file = serializers.FileField(read_only=True) #obtain the url only
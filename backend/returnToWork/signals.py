@@ -0,0 +1,88 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+
+from returnToWork.models import (
+    CONTENT_MODELS, Module, ProgressTracker, Tags, Questionnaire, TermsAndConditions, User, AdminVerification
+)
+from returnToWork.manifest import bump_module_version
+from returnToWork.response_cache import invalidate
+
+
+def remember_previous_module(sender, instance, **kwargs):
+    """Store the module a content item belonged to before this save, so a move can be detected"""
+    if instance._state.adding:
+        instance._previous_module_id = None
+    else:
+        instance._previous_module_id = sender.objects.filter(pk=instance.pk).values_list('moduleID', flat=True).first()
+
+
+def content_saved(sender, instance, created, **kwargs):
+    """Invalidate the module manifest and keep total_contents of the module's trackers in step when content is added or moved"""
+    bump_module_version(instance.moduleID_id)
+
+    if created:
+        ProgressTracker.shift_counts(ProgressTracker.objects.filter(module_id=instance.moduleID_id), total_delta=1)
+        return
+
+    previous_module_id = getattr(instance, '_previous_module_id', None)
+    if previous_module_id and previous_module_id != instance.moduleID_id:
+        bump_module_version(previous_module_id)
+
+        # Moving content between modules changes both totals and viewed counts, so recount both modules
+        ProgressTracker.recompute(
+            ProgressTracker.objects.filter(module_id__in=[previous_module_id, instance.moduleID_id])
+            .values_list('user_id', 'module_id')
+        )
+
+
+def content_deleted(sender, instance, **kwargs):
+    """Remove a deleted content item from the module's trackers before its ContentProgress rows cascade away"""
+    bump_module_version(instance.moduleID_id)
+
+    trackers = ProgressTracker.objects.filter(module_id=instance.moduleID_id)
+    viewers = instance.progress_records.filter(viewed=True).values('user')
+
+    ProgressTracker.shift_counts(trackers.filter(user__in=viewers), completed_delta=-1, total_delta=-1)
+    ProgressTracker.shift_counts(trackers.exclude(user__in=viewers), total_delta=-1)
+
+
+def module_changed(sender, instance, **kwargs):
+    """Start a fresh manifest version whenever a module is created or deleted, so reused IDs never see old manifests"""
+    if kwargs.get('created', True):
+        bump_module_version(instance.pk)
+
+
+post_save.connect(module_changed, sender=Module, dispatch_uid='manifest_module_post_save')
+post_delete.connect(module_changed, sender=Module, dispatch_uid='manifest_module_post_delete')
+
+for model in CONTENT_MODELS:
+    pre_save.connect(remember_previous_module, sender=model, dispatch_uid=f'progress_pre_save_{model.__name__}')
+    post_save.connect(content_saved, sender=model, dispatch_uid=f'progress_post_save_{model.__name__}')
+    pre_delete.connect(content_deleted, sender=model, dispatch_uid=f'progress_pre_delete_{model.__name__}')
+
+
+# Response cache groups that go stale when a model changes; see returnToWork.response_cache
+RESPONSE_CACHE_GROUPS = {
+    TermsAndConditions: ('terms',),
+    Questionnaire: ('questionnaire',),
+    Module: ('modules', 'tags'),
+    Tags: ('tags', 'modules'),
+    Module.tags.through: ('modules', 'tags'),
+    Tags.modules.through: ('tags', 'modules'),
+    User: ('admin_users',),
+    AdminVerification: ('admin_users',),
+}
+
+
+def response_cache_stale(sender, **kwargs):
+    """Invalidate the cached responses built from the changed model, ignoring login timestamp updates"""
+    if kwargs.get('update_fields') == frozenset({'last_login'}) or kwargs.get('action', 'post').startswith('pre_'):
+        return
+    invalidate(*RESPONSE_CACHE_GROUPS[sender])
+
+
+for model, groups in RESPONSE_CACHE_GROUPS.items():
+    if model._meta.auto_created:
+        m2m_changed.connect(response_cache_stale, sender=model, dispatch_uid=f'response_cache_m2m_{model.__name__}')
+    else:
+        post_save.connect(response_cache_stale, sender=model, dispatch_uid=f'response_cache_post_save_{model.__name__}')
+        post_delete.connect(response_cache_stale, sender=model, dispatch_uid=f'response_cache_post_delete_{model.__name__}')
@@ -0,0 +1,181 @@
+"""
+Task PDF rendering: a user's answers are loaded for any number of tasks in one query,
+rendered with reportlab flowables so long answers wrap and continue onto new pages,
+and stored in default_storage under a hash of those answers so repeat downloads are
+plain file reads. Renders can optionally run on a thread or process pool.
+"""
+import hashlib
+import logging
+import posixpath
+import threading
+import zipfile
+from collections import namedtuple, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import FilteredRelation, Q
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from returnToWork.models import QuizQuestion
+
+logger = logging.getLogger(__name__)
+
+TaskAnswer = namedtuple('TaskAnswer', ['question_text', 'response_text', 'submitted_at'])
+
+NO_RESPONSE = "No response provided"
+PDF_DIRECTORY = 'task_pdfs'
+
+ZIP_ARCHIVE_NAME = 'completed-tasks.zip'
+
+_executor = None
+_pending = {}
+_lock = threading.RLock()
+
+
+def load_task_answers(user, tasks):
+    """Return {task_id: [TaskAnswer, ...]} in question order for every given task that has questions, using one query"""
+    questions = (
+        QuizQuestion.objects.filter(task__in=tasks)
+        .annotate(user_response=FilteredRelation('responses', condition=Q(responses__user=user)))
+        .order_by('task', 'order', 'id')
+        .values_list('task_id', 'question_text', 'user_response__response_text', 'user_response__submitted_at')
+    )
+
+    answers = defaultdict(list)
+    for task_id, question_text, response_text, submitted_at in questions:
+        answers[task_id].append(TaskAnswer(question_text, response_text, submitted_at))
+    return answers
+
+
+def artifact_name(user, task, answers):
+    """Storage name of the task's PDF for this exact set of answers"""
+    digest = hashlib.sha256(task.title.encode())
+    for answer in answers:
+        digest.update(repr(tuple(answer)).encode())
+    return f'{PDF_DIRECTORY}/{user.pk}/{task.pk}/{digest.hexdigest()[:32]}.pdf'
+
+
+def render_task_pdf(title, answers):
+    """Render a task's questions and answers to PDF bytes; kept free of ORM objects so it can run in another process"""
+    styles = getSampleStyleSheet()
+    story = [Paragraph(f"Task: {escape(title)}", styles['Title'])]
+
+    for question_text, response_text, _ in answers:
+        answer = escape(response_text) if response_text else NO_RESPONSE
+        story.append(Paragraph(f"Question: {escape(question_text)}", styles['Heading4']))
+        story.append(Paragraph(f"Answer: {answer}".replace('\n', '<br/>'), styles['BodyText']))
+        story.append(Spacer(1, 0.4 * cm))
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title=title).build(story)
+    return buffer.getvalue()
+
+
+def save_artifact(name, content):
+    """
+    Store a rendered PDF, then remove older renders of the same task for the same user. The new
+    file is written first and never deleted, so a concurrent request can always open it; a
+    duplicate saved under a suffixed name by a concurrent render of the same answers is removed.
+    """
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    directory, keep = posixpath.split(name)
+    for stale in default_storage.listdir(directory)[1]:
+        if stale != keep:
+            default_storage.delete(posixpath.join(directory, stale))
+
+
+def get_render_executor():
+    """Return the pool configured by TASK_PDF_RENDER_MODE, or None to render inside the request"""
+    global _executor
+    mode = getattr(settings, 'TASK_PDF_RENDER_MODE', 'inline')
+    if mode == 'inline':
+        return None
+
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, 'TASK_PDF_RENDER_WORKERS', 2)
+            _executor = ProcessPoolExecutor(workers) if mode == 'process' else ThreadPoolExecutor(workers)
+    return _executor
+
+
+def _finish_render(name, future):
+    try:
+        save_artifact(name, future.result())
+    except Exception:
+        logger.exception("Rendering %s failed", name)
+    finally:
+        with _lock:
+            _pending.pop(name, None)
+
+
+def get_task_pdf(user, task, answers):
+    """
+    Return the storage name of the task's PDF, rendering it first when it is not cached.
+    Returns None while a background render is still running.
+    """
+    name = artifact_name(user, task, answers)
+    if default_storage.exists(name):
+        return name
+
+    executor = get_render_executor()
+    if executor is None:
+        save_artifact(name, render_task_pdf(task.title, answers))
+        return name
+
+    with _lock:
+        if name not in _pending:
+            future = executor.submit(render_task_pdf, task.title, answers)
+            _pending[name] = future
+            future.add_done_callback(lambda done: _finish_render(name, done))
+    return None
+
+
+class ZipStream:
+    """Write-only file object that collects what zipfile writes so it can be handed out chunk by chunk"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def pdf_filename(task):
+    return f'{task.title.replace(" ", "-")}_completed.pdf'
+
+
+def stream_tasks_zip(tasks, answers):
+    """Yield a ZIP archive with one rendered PDF per task, one file at a time, so the archive is never held in memory"""
+    stream = ZipStream()
+    used_names = set()
+
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for task in tasks:
+            name = pdf_filename(task)
+            stem, counter = name[:-len('.pdf')], 1
+            while name in used_names:
+                counter += 1
+                name = f'{stem}-{counter}.pdf'
+            used_names.add(name)
+
+            archive.writestr(name, render_task_pdf(task.title, answers[task.pk]))
+            yield stream.pop()
+    yield stream.pop()
@@ -0,0 +1,28 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from returnToWork.models import PendingSignup
+
+
+class PurgeExpiredSignupsCommandTest(TestCase):
+    """Test cases for purge_expired_signups management command."""
+
+    def create_signup(self, username):
+        return PendingSignup.create_for({
+            'username': username,
+            'email': f'{username[1:]}@example.com',
+            'password': 'password123',
+        })
+
+    def test_only_expired_signups_are_removed(self):
+        active = self.create_signup('@active')
+        for username in ('@expired1', '@expired2'):
+            self.create_signup(username)
+        PendingSignup.objects.exclude(pk=active.pk).update(expires_at=timezone.now())
+
+        out = io.StringIO()
+        call_command('purge_expired_signups', stdout=out)
+
+        self.assertIn('Removed 2 expired sign-ups', out.getvalue())
+        self.assertEqual(list(PendingSignup.objects.values_list('pk', flat=True)), [active.pk])
@@ -0,0 +1,56 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from returnToWork.models import Module, ProgressTracker
+
+User = get_user_model()
+
+class ReconcileUpvotesCommandTest(TestCase):
+    """Test cases for reconcile_upvotes management command."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'@testuser{i}',
+                email=f'test{i}@example.com',
+                password='password123',
+                first_name='Test',
+                last_name='User',
+                user_type='service user'
+            )
+            for i in range(3)
+        ]
+        # Module with drifted upvotes: two likes recorded but five counted
+        self.module = Module.objects.create(title="Test Module", description="Test module description", upvotes=5)
+        for user, liked in zip(self.users, (True, True, False)):
+            ProgressTracker.objects.create(user=user, module=self.module, hasLiked=liked)
+        # Module with no trackers at all
+        self.other_module = Module.objects.create(title="Other Module", description="Other", upvotes=3)
+
+    def test_reconciles_upvotes_from_likes(self):
+        out = io.StringIO()
+        call_command('reconcile_upvotes', stdout=out)
+
+        self.module.refresh_from_db()
+        self.other_module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 2)
+        self.assertEqual(self.other_module.upvotes, 0)
+        self.assertIn('Reconciled 2 drifted modules', out.getvalue())
+
+    def test_module_option_limits_scope(self):
+        call_command('reconcile_upvotes', module=self.module.id, stdout=io.StringIO())
+
+        self.module.refresh_from_db()
+        self.other_module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 2)
+        self.assertEqual(self.other_module.upvotes, 3)
+
+    def test_dry_run_changes_nothing(self):
+        out = io.StringIO()
+        call_command('reconcile_upvotes', dry_run=True, stdout=out)
+
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 5)
+        self.assertIn(f'Module {self.module.id}: 5 upvotes, 2 likes', out.getvalue())
+        self.assertIn('Found 2 drifted modules', out.getvalue())
@@ -0,0 +1,62 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from returnToWork.models import Module, Document, ContentProgress, ProgressTracker
+
+User = get_user_model()
+
+class RecountProgressCommandTest(TestCase):
+    """Test cases for recount_progress management command."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='@testuser',
+            email='test@example.com',
+            password='password123',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.module = Module.objects.create(title="Test Module", description="Test module description")
+        self.document = Document.objects.create(
+            title="Test Document",
+            moduleID=self.module,
+            author=self.user,
+            filename="test.pdf",
+            file_type="pdf"
+        )
+        ContentProgress.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(Document),
+            object_id=self.document.contentID,
+            viewed=True
+        )
+        # Tracker with drifted counters
+        self.tracker = ProgressTracker.objects.create(
+            user=self.user,
+            module=self.module,
+            contents_completed=7,
+            total_contents=9
+        )
+
+    def test_recount_repairs_counters(self):
+        out = io.StringIO()
+        call_command('recount_progress', stdout=out)
+
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.total_contents, 1)
+        self.assertEqual(self.tracker.contents_completed, 1)
+        self.assertEqual(self.tracker.progress_percentage, 100.0)
+        self.assertTrue(self.tracker.completed)
+        self.assertIn('Recounted 1 progress trackers', out.getvalue())
+
+    def test_recount_filters_by_module(self):
+        other_module = Module.objects.create(title="Other Module", description="Other")
+        out = io.StringIO()
+        call_command('recount_progress', module=other_module.id, stdout=out)
+
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.contents_completed, 7)
+        self.assertIn('Recounted 0 progress trackers', out.getvalue())
@@ -299,4 +299,66 @@ class ContentProgressTests(TestCase):
         
         # Just check that the user and content type are in the string
         self.assertIn(self.user.username, model_str)
-        self.assertIn(str(self.document_ct), model_str)
\ No newline at end of file
+        self.assertIn(str(self.document_ct), model_str)
+
+    def test_mark_as_viewed_increments_only_once(self):
+        """Test that marking the same item twice only counts it once"""
+        ContentProgress.objects.filter(user=self.user).delete()
+        ProgressTracker.objects.filter(user=self.user).delete()
+
+        progress = ContentProgress.objects.create(
+            user=self.user,
+            content_type=self.document_ct,
+            object_id=self.document.contentID
+        )
+        tracker = progress.mark_as_viewed()
+        self.assertEqual(tracker.contents_completed, 1)
+        self.assertEqual(tracker.total_contents, 3)
+
+        tracker = progress.mark_as_viewed()
+        self.assertEqual(tracker.contents_completed, 1)
+
+    def test_adding_and_removing_content_adjusts_totals(self):
+        """Test that module totals follow content being added and deleted"""
+        ProgressTracker.objects.filter(user=self.user).delete()
+        progress = ContentProgress.objects.create(
+            user=self.user,
+            content_type=self.document_ct,
+            object_id=self.document.contentID
+        )
+        tracker = progress.mark_as_viewed()
+
+        new_video = EmbeddedVideo.objects.create(
+            title="New Video",
+            moduleID=self.module,
+            author=self.author,
+            video_url="https://www.youtube.com/watch?v=new"
+        )
+        tracker.refresh_from_db()
+        self.assertEqual(tracker.total_contents, 4)
+        self.assertEqual(tracker.progress_percentage, 25.0)
+
+        new_video.delete()
+        self.document.delete()
+        tracker.refresh_from_db()
+        self.assertEqual(tracker.total_contents, 2)
+        self.assertEqual(tracker.contents_completed, 0)
+        self.assertEqual(tracker.progress_percentage, 0.0)
+
+    def test_incremental_counts_match_full_recount(self):
+        """Test that the incremental counters agree with a full recount"""
+        ProgressTracker.objects.filter(user=self.user).delete()
+        for content in (self.document, self.video, self.task):
+            ContentProgress.objects.create(
+                user=self.user,
+                content_type=ContentType.objects.get_for_model(content),
+                object_id=content.contentID
+            ).mark_as_viewed()
+
+        tracker = ProgressTracker.objects.get(user=self.user, module=self.module)
+        self.assertTrue(tracker.completed)
+        self.assertEqual(tracker.progress_percentage, 100.0)
+
+        incremental = (tracker.total_contents, tracker.contents_completed)
+        tracker.update_progress()
+        self.assertEqual((tracker.total_contents, tracker.contents_completed), incremental)
@@ -33,6 +33,26 @@ class ModuleModelTest(TestCase):
         self.module.downvote()
         self.assertEqual(self.module.upvotes, 9)
 
+    def test_upvote_keeps_concurrent_votes(self):
+        """Test a stale copy of the module does not overwrite votes cast through another copy."""
+        stale_copy = Module.objects.get(pk=self.module.pk)
+        self.module.upvote()
+        stale_copy.upvote()
+        self.assertEqual(stale_copy.upvotes, 12)
+        self.assertEqual(Module.objects.get(pk=self.module.pk).upvotes, 12)
+
+    def test_upvote_only_writes_the_counter(self):
+        """Test voting does not re-save the rest of the module."""
+        Module.objects.filter(pk=self.module.pk).update(title="lowercase title")
+        self.module.upvote()
+        self.assertEqual(Module.objects.get(pk=self.module.pk).title, "lowercase title")
+
+    def test_downvote_stops_at_zero(self):
+        """Test the downvote method never makes the counter negative."""
+        Module.objects.filter(pk=self.module.pk).update(upvotes=0)
+        self.module.downvote()
+        self.assertEqual(self.module.upvotes, 0)
+
     def test_module_string_representation(self):
         """Test the string representation of the module."""
         self.assertEqual(str(self.module), "Handling Work Stress")
@@ -1,5 +1,6 @@
 from django.test import TestCase
-from returnToWork.models import ProgressTracker,Module,User
+from django.contrib.contenttypes.models import ContentType
+from returnToWork.models import ProgressTracker,Module,User,Document,EmbeddedVideo,ContentProgress,CONTENT_MODELS
 
 class ProgressTrackerModelTest(TestCase):
     
@@ -76,22 +77,55 @@ class ProgressTrackerModelTest(TestCase):
         tracker_id = self.progressTracker.id
         self.progressTracker.delete()
         with self.assertRaises(ProgressTracker.DoesNotExist):
-            ProgressTracker.objects.get(id=tracker_id)    
-
-    
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+            ProgressTracker.objects.get(id=tracker_id)
+
+    def _create_contents(self, module):
+        author = User.objects.filter(username='@authoruser').first() or User.objects.create_user(
+            username='@authoruser',
+            first_name='Author',
+            last_name='User',
+            email='author@example.org',
+            password='SecurePass123',
+            user_type='admin',
+        )
+        document = Document.objects.create(title="Doc", moduleID=module, author=author, filename="doc.pdf", file_type="pdf")
+        video = EmbeddedVideo.objects.create(title="Video", moduleID=module, author=author, video_url="https://www.youtube.com/watch?v=test")
+        return document, video
+
+    def test_update_progress_counts_each_content_once(self):
+        document, video = self._create_contents(self.module)
+        ContentProgress.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(Document),
+            object_id=document.contentID,
+            viewed=True,
+        )
+        self.progressTracker.update_progress()
+        self.assertEqual(self.progressTracker.total_contents, 2)
+        self.assertEqual(self.progressTracker.contents_completed, 1)
+        self.assertEqual(self.progressTracker.progress_percentage, 50)
+
+    def test_count_progress_uses_fixed_number_of_queries(self):
+        other_module = Module.objects.create(title="Other", description="Other module")
+        document, _ = self._create_contents(self.module)
+        self._create_contents(other_module)
+        ContentProgress.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(Document),
+            object_id=document.contentID,
+            viewed=True,
+        )
+        ContentType.objects.get_for_models(*CONTENT_MODELS)
+        with self.assertNumQueries(2):
+            counts = ProgressTracker.count_progress([(self.user, self.module), (self.user, other_module)])
+        self.assertEqual(counts[(self.user.id, self.module.id)], (2, 1))
+        self.assertEqual(counts[(self.user.id, other_module.id)], (2, 0))
+
+    def test_recompute_creates_missing_trackers(self):
+        other_module = Module.objects.create(title="Other", description="Other module")
+        self._create_contents(other_module)
+        trackers = ProgressTracker.recompute([(self.user.id, other_module.id)])
+        self.assertEqual(len(trackers), 1)
+        tracker = ProgressTracker.objects.get(user=self.user, module=other_module)
+        self.assertEqual(tracker.total_contents, 2)
+        self.assertEqual(tracker.contents_completed, 0)
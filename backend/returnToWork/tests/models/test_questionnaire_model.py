@@ -43,6 +43,23 @@ class QuestionnaireTestCase(TestCase):
         with self.assertRaises(ValidationError):
             self.no_question.full_clean()
 
+    def test_circular_question_reports_path(self):
+        self.initial_q.save()
+        self.no_question.yes_next_q = self.initial_q
+        with self.assertRaises(ValidationError) as context:
+            self.no_question.full_clean()
+        expected_path = f"{self.no_question.id} -> {self.initial_q.id} -> {self.no_question.id}"
+        self.assertIn(expected_path, str(context.exception))
+
+    def test_shared_subtrees_are_checked_with_one_query(self):
+        """Test a deep chain where every question points twice at the next is validated in one query"""
+        question = Questionnaire.objects.create(question="Last question")
+        for i in range(30):
+            question = Questionnaire.objects.create(question=f"Question {i}", yes_next_q=question, no_next_q=question)
+
+        with self.assertNumQueries(1):
+            question.clean()
+
     def test_questionaire_string_representation(self):
         question = Questionnaire.objects.create(
         question= "Are you happy?",
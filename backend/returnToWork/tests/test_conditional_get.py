@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from returnToWork.models import Module, Task, Tags
+from returnToWork.serializers import TaskSerializer
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="@admin",
+            email="admin@example.com",
+            password="password123",
+            user_type="admin"
+        )
+        self.module = Module.objects.create(title="Module", description="Description")
+        self.task = Task.objects.create(
+            title="Task",
+            moduleID=self.module,
+            author=self.admin,
+            text_content="Some text"
+        )
+        self.list_url = reverse('task-list')
+        self.detail_url = reverse('task-detail', kwargs={'pk': self.task.contentID})
+
+    def test_responses_carry_validators(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        with patch.object(TaskSerializer, 'to_representation') as to_representation, self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        to_representation.assert_not_called()
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_updates_creates_and_deletes(self):
+        etags = [self.client.get(self.list_url)['ETag']]
+
+        self.task.title = "Renamed"
+        self.task.save()
+        etags.append(self.client.get(self.list_url)['ETag'])
+
+        other = Task.objects.create(title="Other", moduleID=self.module, author=self.admin, text_content="Text")
+        etags.append(self.client.get(self.list_url)['ETag'])
+
+        other.delete()
+        etags.append(self.client.get(self.list_url)['ETag'])
+        self.assertEqual(len(set(etags[:3])), 3)
+        self.assertEqual(etags[3], etags[1])
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, 200)
+
+    def test_filtered_lists_have_their_own_etag(self):
+        all_tasks = self.client.get(self.list_url)['ETag']
+        filtered = self.client.get(self.list_url, {'module_id': self.module.id})['ETag']
+        self.assertNotEqual(all_tasks, filtered)
+
+    def test_module_etag_changes_when_tags_change(self):
+        url = reverse('module-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.module.tags.add(Tags.objects.create(tag="anxiety"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data[0]['tags']), 1)
+
+    def test_writes_are_not_conditional(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.delete(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 204)
+
+    def test_malformed_pk_returns_404(self):
+        for url in (
+            reverse('task-detail', kwargs={'pk': 'not-a-uuid'}),
+            reverse('module-detail', kwargs={'pk': 'abc'}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertNotIn('ETag', response)
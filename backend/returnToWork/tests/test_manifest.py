@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+
+from returnToWork.models import Module, Document, EmbeddedVideo, CONTENT_MODELS
+from returnToWork.manifest import get_module_manifest, get_module_manifests
+
+User = get_user_model()
+
+class ModuleManifestTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='@authoruser',
+            email='author@example.com',
+            password='password123',
+            first_name='Author',
+            last_name='User',
+            user_type='admin'
+        )
+        self.module = Module.objects.create(title="Test Module", description="Test module description")
+        self.video = EmbeddedVideo.objects.create(
+            title="Test Video",
+            moduleID=self.module,
+            author=self.author,
+            video_url="https://www.youtube.com/watch?v=test",
+            order_index=2
+        )
+        self.document = Document.objects.create(
+            title="Test Document",
+            moduleID=self.module,
+            author=self.author,
+            filename="test.pdf",
+            file_type="pdf",
+            order_index=1,
+            is_published=True
+        )
+        ContentType.objects.get_for_models(*CONTENT_MODELS)
+
+    def test_manifest_is_ordered_by_order_index(self):
+        manifest = get_module_manifest(self.module)
+        self.assertEqual([entry.content_id for entry in manifest], [self.document.contentID, self.video.contentID])
+        self.assertEqual(manifest[0].content_type, ContentType.objects.get_for_model(Document).id)
+        self.assertTrue(manifest[0].is_published)
+        self.assertFalse(manifest[1].is_published)
+
+    def test_manifest_is_served_from_cache(self):
+        get_module_manifest(self.module)
+        with self.assertNumQueries(0):
+            manifest = get_module_manifest(self.module)
+        self.assertEqual(len(manifest), 2)
+
+    def test_manifest_is_invalidated_on_save_and_delete(self):
+        get_module_manifest(self.module)
+
+        self.document.order_index = 5
+        self.document.save()
+        manifest = get_module_manifest(self.module)
+        self.assertEqual(manifest[-1].content_id, self.document.contentID)
+
+        self.video.delete()
+        self.assertEqual(len(get_module_manifest(self.module)), 1)
+
+    def test_manifests_for_many_modules_built_in_one_query(self):
+        other_module = Module.objects.create(title="Other Module", description="Other")
+        with self.assertNumQueries(1):
+            manifests = get_module_manifests([self.module, other_module])
+        self.assertEqual(len(manifests[self.module.id]), 2)
+        self.assertEqual(manifests[other_module.id], [])
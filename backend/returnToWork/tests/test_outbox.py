@@ -0,0 +1,92 @@
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from returnToWork.models import OutgoingEmail
+from returnToWork.outbox import queue_mail, send_pending_mail, MAX_ATTEMPTS
+
+
+class OutboxTests(TestCase):
+    def queue(self, recipient='user@example.com'):
+        return queue_mail(
+            subject="Subject",
+            message="Body",
+            from_email="sender@example.com",
+            recipient_list=[recipient],
+        )
+
+    def test_queue_mail_stores_without_sending(self):
+        email = self.queue()
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.recipients, ['user@example.com'])
+
+    def test_queue_mail_wakes_worker_after_commit(self):
+        with patch('returnToWork.outbox.worker.wake') as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.queue()
+                wake.assert_not_called()
+            wake.assert_called_once()
+
+    @override_settings(EMAIL_OUTBOX_WORKER='command')
+    def test_command_mode_does_not_wake_worker(self):
+        with patch('returnToWork.outbox.worker.wake') as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.queue()
+            wake.assert_not_called()
+
+    def test_send_pending_mail_sends_batch_over_one_connection(self):
+        for index in range(3):
+            self.queue(f'user{index}@example.com')
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.open') as open_connection:
+            self.assertEqual(send_pending_mail(), 3)
+        open_connection.assert_called_once()
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status='sent').exists())
+        self.assertFalse(OutgoingEmail.objects.exclude(body='').exists())
+        self.assertEqual(send_pending_mail(), 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = self.queue()
+
+        with patch('django.core.mail.EmailMessage.send', side_effect=OSError("SMTP down")):
+            send_pending_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTP down", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # Not due yet, so nothing is sent until the backoff passes
+        self.assertEqual(send_pending_mail(), 0)
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        send_pending_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'sent')
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        email = self.queue()
+        OutgoingEmail.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+        with patch('django.core.mail.EmailMessage.send', side_effect=OSError("Rejected")):
+            send_pending_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.body, '')
+
+    def test_send_queued_mail_command(self):
+        self.queue()
+        out = io.StringIO()
+        call_command('send_queued_mail', stdout=out)
+
+        self.assertIn('Processed 1 queued emails', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from returnToWork.models import Module, Tags, TermsAndConditions, AdminVerification
+from returnToWork.response_cache import cache_response
+
+User = get_user_model()
+
+
+class WhoAmIView(APIView):
+    calls = 0
+
+    @cache_response('whoami', per_user=True)
+    def get(self, request):
+        WhoAmIView.calls += 1
+        return Response({'username': request.user.username})
+
+
+class LatestTermsView(APIView):
+    @cache_response('terms')
+    def get(self, request):
+        terms = TermsAndConditions.objects.first()
+        if terms is None:
+            return Response(status=404)
+        return Response({'content': terms.content})
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.superadmin = User.objects.create_user(
+            username="@superadmin",
+            email="superadmin@example.com",
+            password="password123",
+            user_type="superadmin"
+        )
+        self.admin = User.objects.create_user(
+            username="@admin",
+            email="admin@example.com",
+            password="password123",
+            user_type="admin"
+        )
+        self.module = Module.objects.create(title="Module", description="Description")
+        self.tag = Tags.objects.create(tag="anxiety")
+
+    def test_module_list_is_served_from_cache(self):
+        self.client.get('/api/modules/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/modules/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([module['title'] for module in response.data], ["Module"])
+
+    def test_module_list_is_invalidated_on_save_and_tag_change(self):
+        self.client.get('/api/modules/')
+
+        self.module.title = "Renamed"
+        self.module.save()
+        response = self.client.get('/api/modules/')
+        self.assertEqual(response.data[0]['title'], "Renamed")
+
+        self.module.tags.add(self.tag)
+        response = self.client.get('/api/modules/')
+        self.assertEqual(response.data[0]['tags'], [self.tag.id])
+
+    def test_tag_list_is_invalidated_when_a_nested_module_changes(self):
+        self.tag.modules.add(self.module)
+        self.client.get('/api/tags/')
+
+        self.module.title = "Renamed"
+        self.module.save()
+        response = self.client.get('/api/tags/')
+        self.assertEqual(response.data[0]['modules'][0]['title'], "Renamed")
+
+    def test_terms_are_invalidated_on_update(self):
+        url = reverse("terms-and-conditions")
+        self.assertEqual(self.client.get(url).data['content'], "")
+
+        TermsAndConditions.objects.create(content="hello", created_by=self.superadmin)
+        self.assertEqual(self.client.get(url).data['content'], "hello")
+
+    def test_error_responses_are_not_cached(self):
+        factory = APIRequestFactory()
+        view = LatestTermsView.as_view()
+        self.assertEqual(view(factory.get('/latest-terms/')).status_code, 404)
+
+        TermsAndConditions.objects.create(content="hello", created_by=self.superadmin)
+        response = view(factory.get('/latest-terms/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['content'], "hello")
+
+    def test_admin_list_is_invalidated_on_verification(self):
+        url = reverse('admin-users-list')
+        self.assertEqual([user['username'] for user in self.client.get(url).data], ["@superadmin"])
+
+        AdminVerification.objects.create(admin=self.admin, is_verified=True)
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+    def test_admin_list_is_not_invalidated_by_logins(self):
+        User.objects.filter(pk=self.superadmin.pk).update(is_first_login=False)
+        self.client.get(reverse('admin-users-list'))
+        response = self.client.post(reverse('login'), {"username": "@superadmin", "password": "password123"})
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('admin-users-list'))
+
+    def test_per_user_cache_keeps_users_apart(self):
+        factory = APIRequestFactory()
+        view = WhoAmIView.as_view()
+        WhoAmIView.calls = 0
+
+        for user in (self.admin, self.superadmin, self.admin):
+            request = factory.get('/whoami/')
+            force_authenticate(request, user=user)
+            response = view(request)
+            self.assertEqual(response.data['username'], user.username)
+        self.assertEqual(WhoAmIView.calls, 2)
@@ -214,4 +214,99 @@ class AdminQuizResponsesViewTests(APITestCase):
         self.assertEqual(user_response['username'], self.service_user.username)
         self.assertEqual(user_response['user_full_name'], f"{self.service_user.first_name} {self.service_user.last_name}")
         self.assertEqual(user_response['response_text'], 'This is my first response')
-        self.assertIn('submitted_at', user_response)  # Timestamp field exists
\ No newline at end of file
+        self.assertIn('submitted_at', user_response)  # Timestamp field exists
+
+    def test_responses_fetched_in_fixed_number_of_queries(self):
+        """Test that the number of queries does not grow with the number of questions"""
+        self.client.force_authenticate(user=self.admin_user)
+        for order in range(3, 13):
+            question = QuizQuestion.objects.create(task=self.task, question_text=f'Question {order}', order=order)
+            UserResponse.objects.create(user=self.service_user, question=question, response_text='Answer')
+
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        # Task, page of responses with their users, questions
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['responses']), 12)
+
+    def test_responses_are_cursor_paginated(self):
+        """Test that responses can be paged through with the next cursor"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+
+        seen = []
+        next_url = f'{url}?limit=2'
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['responses']), 2)  # Every question is always listed
+            seen.extend(r['response_text'] for q in response.data['responses'] for r in q['responses'])
+            next_url = response.data['next']
+
+        self.assertCountEqual(seen, [
+            'This is my first response', 'This is my implementation plan', 'I have a different perspective'
+        ])
+
+    def test_since_filters_older_responses(self):
+        """Test that only responses submitted after the since timestamp are returned"""
+        self.client.force_authenticate(user=self.admin_user)
+        cutoff = self.response3.submitted_at
+        UserResponse.objects.filter(pk__in=[self.response1.pk, self.response2.pk]).update(
+            submitted_at=cutoff - timedelta(days=1)
+        )
+
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'since': (cutoff - timedelta(hours=1)).isoformat()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        question1_data = next(q for q in response.data['responses'] if q['question_id'] == self.question1.id)
+        question2_data = next(q for q in response.data['responses'] if q['question_id'] == self.question2.id)
+        self.assertEqual([r['response_text'] for r in question1_data['responses']], ['I have a different perspective'])
+        self.assertEqual(question2_data['responses'], [])
+
+    def test_invalid_since_rejected(self):
+        """Test that a malformed since timestamp returns a 400"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'since': 'yesterday'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_impossible_since_rejected(self):
+        """Test that a well formed but impossible since timestamp returns a 400"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'since': '2024-02-30T10:00:00'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_responses_unpaginated_without_limit(self):
+        """Test that clients not asking for ?limit= still receive every response and no next link"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        response = self.client.get(url)
+
+        self.assertIsNone(response.data['next'])
+        seen = [r['response_text'] for q in response.data['responses'] for r in q['responses']]
+        self.assertEqual(len(seen), 3)
+
+    def test_edited_response_reappears_after_since(self):
+        """Test that editing an answer moves its submitted_at forward, so it is picked up by ?since="""
+        UserResponse.objects.update(submitted_at=self.response1.submitted_at - timedelta(days=1))
+        cutoff = self.response1.submitted_at - timedelta(hours=1)
+
+        self.client.force_authenticate(user=self.service_user)
+        self.client.post(reverse('quiz_response'), {
+            'question_id': self.question2.id,
+            'response_text': 'A revised implementation plan'
+        }, format='json')
+
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'since': cutoff.isoformat()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        seen = [r['response_text'] for q in response.data['responses'] for r in q['responses']]
+        self.assertEqual(seen, ['A revised implementation plan'])
@@ -1,7 +1,9 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
-from returnToWork.models import User, AdminVerification
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from returnToWork.models import User, AdminVerification, Module, Tags
 
 class AdminUsersViewTests(APITestCase):
     def setUp(self):
@@ -29,6 +31,51 @@ class AdminUsersViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(any(user['username'] == 'admin1' for user in response.data))
 
+    def create_admins(self, count, start=0):
+        module = Module.objects.create(title="Module", description="Description")
+        tag = Tags.objects.create(tag=f"tag{start}")
+        module.tags.add(tag)
+        for i in range(start, start + count):
+            admin = User.objects.create_user(
+                username=f'admin{i}',
+                email=f'admin{i}@example.com',
+                password='pass2',
+                user_type='admin'
+            )
+            admin.module.add(module)
+            admin.tags.add(tag)
+            AdminVerification.objects.create(admin=admin, is_verified=i % 2 == 0)
+
+    def count_list_queries(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.admin_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response
+
+    def test_get_admin_users_query_count_does_not_grow_with_admins(self):
+        self.authenticate(self.superadmin)
+        self.create_admins(1)
+        few_queries, _ = self.count_list_queries()
+
+        self.create_admins(5, start=1)
+        many_queries, response = self.count_list_queries()
+
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(len(response.data), 6)
+        admin0 = next(user for user in response.data if user['username'] == 'admin0')
+        self.assertTrue(admin0['is_verified'])
+        self.assertEqual(admin0['tags'], ['tag0'])
+        self.assertEqual(admin0['module'][0]['tags'], [Tags.objects.get(tag='tag0').id])
+
+    def test_get_admin_users_paginated(self):
+        self.authenticate(self.superadmin)
+        self.create_admins(3)
+
+        response = self.client.get(self.admin_url, {'limit': 2})
+        self.assertEqual([user['username'] for user in response.data['results']], ['admin0', 'admin1'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([user['username'] for user in response.data['results']], ['admin2'])
+
     def test_non_superadmin_cannot_get_admin_users(self):
         admin_user = User.objects.create_user(
             username='nonsuper',
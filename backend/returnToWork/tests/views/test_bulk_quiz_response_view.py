@@ -0,0 +1,120 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from returnToWork.models import User, Task, QuizQuestion, UserResponse, Module
+import uuid
+from datetime import timedelta
+from django.utils import timezone
+
+
+class BulkQuizResponseViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='@testuser',
+            email='test@example.com',
+            password='testpassword123',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.module = Module.objects.create(title='Test Module', description='A test module description')
+        self.task = Task.objects.create(
+            title='Test Quiz',
+            quiz_type='text_input',
+            author=self.user,
+            moduleID=self.module
+        )
+        self.other_task = Task.objects.create(
+            title='Other Quiz',
+            quiz_type='text_input',
+            author=self.user,
+            moduleID=self.module
+        )
+        self.questions = [
+            QuizQuestion.objects.create(task=self.task, question_text=f'Question {order}', order=order)
+            for order in range(1, 6)
+        ]
+        self.other_question = QuizQuestion.objects.create(task=self.other_task, question_text='Other', order=1)
+        self.url = reverse('quiz_response_bulk')
+
+    def test_bulk_submission_saves_every_answer(self):
+        """Test that all answers are saved in a fixed number of queries"""
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'task_id': str(self.task.contentID),
+            'answers': {str(q.id): f'Answer {q.order}' for q in self.questions}
+        }
+
+        # Task, question validation, upsert
+        with self.assertNumQueries(3):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['saved'], 5)
+        saved = dict(UserResponse.objects.filter(user=self.user).values_list('question_id', 'response_text'))
+        self.assertEqual(saved, {q.id: f'Answer {q.order}' for q in self.questions})
+
+    def test_resubmission_updates_existing_answers(self):
+        """Test that submitting again updates answers instead of duplicating them"""
+        self.client.force_authenticate(user=self.user)
+        UserResponse.objects.create(user=self.user, question=self.questions[0], response_text='Old answer')
+
+        data = {'task_id': str(self.task.contentID), 'answers': {str(self.questions[0].id): 'New answer'}}
+        self.client.post(self.url, data, format='json')
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        responses = UserResponse.objects.filter(user=self.user, question=self.questions[0])
+        self.assertEqual(responses.count(), 1)
+        self.assertEqual(responses.get().response_text, 'New answer')
+
+    def test_resubmission_refreshes_submitted_at(self):
+        """Test that edited answers move forward in time, so incremental syncs see them"""
+        self.client.force_authenticate(user=self.user)
+        old = UserResponse.objects.create(user=self.user, question=self.questions[0], response_text='Old answer')
+        UserResponse.objects.filter(pk=old.pk).update(submitted_at=timezone.now() - timedelta(days=1))
+
+        data = {'task_id': str(self.task.contentID), 'answers': {str(self.questions[0].id): 'New answer'}}
+        before = timezone.now()
+        self.client.post(self.url, data, format='json')
+
+        self.assertGreaterEqual(UserResponse.objects.get(pk=old.pk).submitted_at, before)
+
+    def test_questions_from_other_tasks_rejected(self):
+        """Test that no answers are saved when any question does not belong to the task"""
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'task_id': str(self.task.contentID),
+            'answers': {str(self.questions[0].id): 'Answer', str(self.other_question.id): 'Wrong quiz'}
+        }
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['invalid_question_ids'], [self.other_question.id])
+        self.assertFalse(UserResponse.objects.filter(user=self.user).exists())
+
+    def test_invalid_payloads_rejected(self):
+        """Test that missing answers and malformed IDs return a 400"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'task_id': str(self.task.contentID)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'task_id': 'not-a-uuid', 'answers': {'1': 'x'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'task_id': str(self.task.contentID), 'answers': {'abc': 'x'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_task_returns_404(self):
+        """Test that an unknown task returns a 404"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'task_id': str(uuid.uuid4()), 'answers': {'1': 'x'}}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unauthenticated_rejected(self):
+        """Test that anonymous users cannot submit answers"""
+        response = self.client.post(self.url, {'task_id': str(self.task.contentID), 'answers': {'1': 'x'}}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
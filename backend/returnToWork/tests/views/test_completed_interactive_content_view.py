@@ -2,6 +2,8 @@ from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from returnToWork.models import Task, Module, ContentProgress
+from django.utils import timezone
+from datetime import timedelta
 from uuid import uuid4
 
 User = get_user_model()
@@ -63,3 +65,58 @@ class CompletedInteractiveContentViewTest(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["content_id"], str(self.task.contentID))
+
+    def create_viewed_tasks(self, count, viewed_at):
+        for index in range(count):
+            task = Task.objects.create(
+                title=f"Task {index}",
+                author=self.user,
+                moduleID=Module.objects.create(title=f"Module {index}", description="Another module"),
+                text_content="Sample content",
+                quiz_type="text_input"
+            )
+            ContentProgress.objects.create(
+                user=self.user,
+                content_type=self.content_type,
+                object_id=task.contentID,
+                viewed=True,
+                viewed_at=viewed_at
+            )
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self.create_viewed_tasks(10, timezone.now())
+        url = "/api/completed-interactive-content/"
+        # Progress rows, then tasks joined to their modules
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 11)
+
+    def test_pagination_with_limit(self):
+        self.create_viewed_tasks(4, timezone.now())
+        url = "/api/completed-interactive-content/"
+        response = self.client.get(url, {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_filters_by_viewed_date_range(self):
+        self.viewed_task.viewed_at = timezone.now()
+        self.viewed_task.save()
+        self.create_viewed_tasks(2, timezone.now() - timedelta(days=30))
+        url = "/api/completed-interactive-content/"
+
+        recent = self.client.get(url, {"viewed_from": (timezone.now() - timedelta(days=1)).date().isoformat()})
+        self.assertEqual([item["content_id"] for item in recent.data], [str(self.task.contentID)])
+
+        older = self.client.get(url, {"viewed_to": (timezone.now() - timedelta(days=2)).isoformat()})
+        self.assertEqual(len(older.data), 2)
+
+    def test_invalid_date_filter(self):
+        response = self.client.get("/api/completed-interactive-content/", {"viewed_from": "last week"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_impossible_date_filter(self):
+        for value in ("2024-02-30", "2024-01-01T25:00:00"):
+            response = self.client.get("/api/completed-interactive-content/", {"viewed_from": value})
+            self.assertEqual(response.status_code, 400)
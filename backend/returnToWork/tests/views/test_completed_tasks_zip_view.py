@@ -0,0 +1,72 @@
+import io
+import zipfile
+
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from returnToWork.models import Task, QuizQuestion, UserResponse, Module, ContentProgress
+
+User = get_user_model()
+
+class CompletedTasksZipViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="@johndoe",
+            password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.module = Module.objects.create(
+            title="Test module",
+            description="test module example"
+        )
+        self.task_ct = ContentType.objects.get_for_model(Task)
+        self.tasks = []
+        for title in ("First Task", "Second Task", "Second Task"):
+            task = Task.objects.create(title=title, author=self.user, moduleID=self.module, text_content="content")
+            question = QuizQuestion.objects.create(task=task, question_text="How are you?")
+            UserResponse.objects.create(user=self.user, question=question, response_text="Good")
+            ContentProgress.objects.create(user=self.user, content_type=self.task_ct, object_id=task.contentID, viewed=True)
+            self.tasks.append(task)
+
+        self.url = reverse("download-completed-tasks")
+
+    def read_archive(self, response):
+        return zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+    def test_zip_contains_a_pdf_per_completed_task(self):
+        unfinished = Task.objects.create(title="Unfinished", author=self.user, moduleID=self.module, text_content="content")
+        QuizQuestion.objects.create(task=unfinished, question_text="Not viewed")
+        ContentProgress.objects.create(user=self.user, content_type=self.task_ct, object_id=unfinished.contentID, viewed=False)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment;"))
+
+        archive = self.read_archive(response)
+        self.assertEqual(
+            sorted(archive.namelist()),
+            ["First-Task_completed.pdf", "Second-Task_completed-2.pdf", "Second-Task_completed.pdf"]
+        )
+        for name in archive.namelist():
+            self.assertTrue(archive.read(name).startswith(b"%PDF"))
+
+    def test_answers_fetched_in_one_query(self):
+        # Tasks, questions joined to the user's answers
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(len(self.read_archive(response).namelist()), 3)
+
+    def test_no_completed_tasks(self):
+        ContentProgress.objects.all().update(viewed=False)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "No completed tasks found")
+
+    def test_only_own_progress_is_exported(self):
+        other_user = User.objects.create_user(username="@janedoe", email="jane@example.com", password="password123")
+        self.client.force_authenticate(user=other_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
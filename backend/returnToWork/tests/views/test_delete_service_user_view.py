@@ -4,6 +4,7 @@ from django.core import mail
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from returnToWork.models import User
+from returnToWork.outbox import send_pending_mail
 
 User = get_user_model()
 
@@ -21,6 +22,8 @@ class DeleteServiceUserViewTest(APITestCase):
         response = self.client.delete(self.url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(User.objects.filter(username=self.user.username).exists())
+        self.assertEqual(len(mail.outbox), 0)  # queued, not sent inside the request
+        send_pending_mail()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "Account deletion")
         self.assertIn("Dear @deleteuser, Your account has been deleted by the admin", mail.outbox[0].body)
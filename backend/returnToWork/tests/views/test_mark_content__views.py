@@ -131,6 +131,39 @@ class MarkContentViewedViewTests(APITestCase):
             delta=0.01
         )
 
+    def test_mark_viewed_after_liking_module(self):
+        """Test a tracker created by liking the module is counted correctly on the first view"""
+        response = self.client.post(
+            reverse('user-interaction', args=[self.module.id]),
+            {'hasLiked': True, 'pinned': False},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('mark-content-viewed'), {
+            'content_id': self.document_id,
+            'content_type': 'infosheet'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        tracker = ProgressTracker.objects.get(user=self.user, module=self.module)
+        self.assertEqual(tracker.contents_completed, 1)
+        self.assertEqual(tracker.total_contents, 3)
+        self.assertAlmostEqual(tracker.progress_percentage, 100 / 3, delta=0.01)
+        self.assertTrue(tracker.hasLiked)
+
+    def test_mark_viewed_recounts_uninitialised_tracker(self):
+        """Test an existing tracker that was never counted gets a full recount instead of an increment"""
+        ProgressTracker.objects.create(user=self.user, module=self.module)
+
+        response = self.client.post(reverse('mark-content-viewed'), {
+            'content_id': self.video_id,
+            'content_type': 'video'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['module_progress']['contents_completed'], 1)
+        self.assertEqual(response.data['module_progress']['total_contents'], 3)
+
     def test_invalid_content_type(self):
         """Test API validation for invalid content type"""
         url = reverse('mark-content-viewed')  # Update with your actual URL name
@@ -0,0 +1,124 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from returnToWork.models import (
+    Module, Document, EmbeddedVideo, Task, RankingQuestion, ContentProgress, CONTENT_MODELS
+)
+
+User = get_user_model()
+
+class ModuleContentsViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='@testuser',
+            email='test@example.com',
+            password='password123',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.author = User.objects.create_user(
+            username='@authoruser',
+            email='author@example.com',
+            password='password123',
+            first_name='Author',
+            last_name='User',
+            user_type='admin'
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.module = Module.objects.create(title="Test Module", description="Test module description")
+        self.task = Task.objects.create(
+            title="Test Quiz",
+            moduleID=self.module,
+            author=self.author,
+            text_content="Test quiz content",
+            is_published=True,
+            order_index=2
+        )
+        self.document = Document.objects.create(
+            title="Test Document",
+            moduleID=self.module,
+            author=self.author,
+            filename="test.pdf",
+            file_type="pdf",
+            is_published=True,
+            order_index=0
+        )
+        self.video = EmbeddedVideo.objects.create(
+            title="Test Video",
+            moduleID=self.module,
+            author=self.author,
+            video_url="https://www.youtube.com/watch?v=test",
+            is_published=True,
+            order_index=1
+        )
+        self.draft = RankingQuestion.objects.create(
+            title="Draft Ranking",
+            moduleID=self.module,
+            author=self.author,
+            tiers=[],
+            is_published=False,
+            order_index=3
+        )
+        ContentProgress.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(EmbeddedVideo),
+            object_id=self.video.contentID,
+            viewed=True,
+            viewed_at=timezone.now()
+        )
+        self.url = reverse('module-contents', args=[self.module.id])
+
+    def test_contents_are_merged_in_order(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = response.data['contents']
+        self.assertEqual(
+            [item['contentID'] for item in contents],
+            [str(self.document.contentID), str(self.video.contentID), str(self.task.contentID)]
+        )
+        self.assertEqual([item['content_type'] for item in contents], ['infosheet', 'video', 'quiz'])
+
+    def test_unpublished_contents_are_excluded(self):
+        response = self.client.get(self.url)
+        ids = [item['contentID'] for item in response.data['contents']]
+        self.assertNotIn(str(self.draft.contentID), ids)
+
+    def test_viewed_flags(self):
+        response = self.client.get(self.url)
+        viewed = {item['contentID']: item['viewed'] for item in response.data['contents']}
+        self.assertTrue(viewed[str(self.video.contentID)])
+        self.assertFalse(viewed[str(self.document.contentID)])
+        self.assertEqual(response.data['contents'][1]['author']['username'], '@authoruser')
+
+    def test_query_count_does_not_grow_with_contents(self):
+        for index in range(5):
+            EmbeddedVideo.objects.create(
+                title=f"Extra Video {index}",
+                moduleID=self.module,
+                author=self.author,
+                video_url="https://www.youtube.com/watch?v=extra",
+                is_published=True,
+                order_index=10 + index
+            )
+        ContentType.objects.get_for_models(*CONTENT_MODELS)
+        self.client.get(self.url)
+
+        # module + one query per present content type + viewed flags
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['contents']), 8)
+
+    def test_nonexistent_module(self):
+        response = self.client.get(reverse('module-contents', args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
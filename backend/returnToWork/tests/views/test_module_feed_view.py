@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from returnToWork.models import Module, ProgressTracker, Tags
+
+User = get_user_model()
+
+class ModuleFeedViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='@testuser',
+            password='pass',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.anxiety = Tags.objects.create(tag="anxiety")
+        self.confidence = Tags.objects.create(tag="confidence")
+        self.stress = Tags.objects.create(tag="stress")
+        self.user.tags.add(self.anxiety, self.confidence)
+
+        # both tags match
+        self.matching = Module.objects.create(title="Matching", description="Test", upvotes=1)
+        self.matching.tags.add(self.anxiety, self.confidence)
+        # one tag matches, more upvotes than the next one
+        self.popular = Module.objects.create(title="Popular", description="Test", upvotes=50)
+        self.popular.tags.add(self.anxiety, self.stress)
+        self.partial = Module.objects.create(title="Partial", description="Test", upvotes=5)
+        self.partial.tags.add(self.confidence)
+        # no tags match
+        self.unrelated = Module.objects.create(title="Unrelated", description="Test", upvotes=100)
+        self.unrelated.tags.add(self.stress)
+
+        self.url = reverse('module-feed')
+        self.client.force_authenticate(user=self.user)
+
+    def feed_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [module['id'] for module in response.data['results']]
+
+    def test_url(self):
+        self.assertEqual(self.url, "/api/modules/feed/")
+
+    def test_ranks_by_shared_tags_then_upvotes(self):
+        self.assertEqual(self.feed_ids(), [self.matching.id, self.popular.id, self.partial.id, self.unrelated.id])
+
+    def test_pinned_first_and_completed_last(self):
+        ProgressTracker.objects.create(user=self.user, module=self.unrelated, pinned=True, hasLiked=True)
+        ProgressTracker.objects.create(user=self.user, module=self.matching, completed=True)
+
+        response = self.client.get(self.url)
+        ids = [module['id'] for module in response.data['results']]
+        self.assertEqual(ids, [self.unrelated.id, self.popular.id, self.partial.id, self.matching.id])
+        self.assertTrue(response.data['results'][0]['pinned'])
+        self.assertTrue(response.data['results'][0]['hasLiked'])
+        self.assertTrue(response.data['results'][-1]['completed'])
+        self.assertEqual(response.data['results'][-1]['matching_tags'], 2)
+
+    def test_feed_is_paginated(self):
+        response = self.client.get(self.url, {'limit': 2})
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual([module['id'] for module in response.data['results']], [self.matching.id, self.popular.id])
+        self.assertEqual(self.feed_ids(limit=2, offset=2), [self.partial.id, self.unrelated.id])
+
+    def test_user_without_tags_gets_most_upvoted_first(self):
+        self.user.tags.clear()
+        self.assertEqual(self.feed_ids(), [self.unrelated.id, self.popular.id, self.partial.id, self.matching.id])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_ranking_is_cached_per_tag_set(self):
+        cache.clear()
+        self.feed_ids()
+
+        # the user's tag set and trackers; the ranking itself comes from the cache
+        with self.assertNumQueries(2):
+            self.feed_ids()
+
+        # upvotes change the ranking straight away
+        for _ in range(46):
+            self.partial.upvote()
+        self.assertEqual(self.feed_ids()[:3], [self.matching.id, self.partial.id, self.popular.id])
@@ -165,6 +165,28 @@ class ProgressTrackerViewTest(APITestCase):
         # Should return both progress trackers
         self.assertEqual(len(response.data), 2)
 
+    def test_get_progress_trackers_filtered_by_module(self):
+        """Test narrowing the trackers with ?module="""
+        response = self.client.get(self.api_url, {"module": self.module2.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tracker["id"] for tracker in response.data], [self.progress_tracker2.id])
+
+    def test_get_progress_trackers_invalid_filter(self):
+        """Test that a malformed filter value is rejected"""
+        response = self.client.get(self.api_url, {"user": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_progress_trackers_paginated(self):
+        """Test paging through the trackers with ?limit="""
+        response = self.client.get(self.api_url, {"limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.progress_tracker2.id)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([tracker["id"] for tracker in response.data["results"]], [self.progress_tracker1.id])
+        self.assertIsNone(response.data["next"])
+
     def test_get_progress_trackers_unauthenticated(self):
         """Test that unauthenticated users can still access the GET endpoint"""
         # No authentication
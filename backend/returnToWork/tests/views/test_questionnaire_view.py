@@ -3,6 +3,7 @@ from returnToWork.models import Questionnaire, User
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from unittest.mock import patch
 
 class QuestionnaireViewTestCase(TestCase):
     fixtures = ['returnToWork/tests/fixtures/default_user.json']
@@ -110,6 +111,139 @@ class QuestionnaireViewTestCase(TestCase):
         response = self.client.put(self.url, data=data,format = "json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+        # links to questions listed later in the payload are kept
+        first = Questionnaire.objects.get(id=1)
+        self.assertEqual(first.yes_next_q_id, 2)
+        self.assertEqual(first.no_next_q_id, 3)
+        self.assertEqual(self.client.get(self.url).data["id"], 1)
 
+    def test_get_root_without_the_usual_text(self):
+        """Test that the first question is the one no other question leads to, whatever its text"""
+        self.initial_q.question = "Shall we begin?"
+        self.initial_q.save()
 
-    
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.initial_q.id)
+
+    def test_steps_are_answered_from_memory(self):
+        """Test that once compiled, walking the questionnaire does not touch the database"""
+        self.client.get(self.url)
+        self.client.logout()
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {"question_id": self.initial_q.id, "answer": "yes"}, format="json")
+        self.assertEqual(response.data["id"], self.yes_question.id)
+
+    def test_tree_is_reloaded_after_a_change(self):
+        """Test that editing a question is visible on the next request"""
+        self.client.get(self.url)
+        self.yes_question.question = "Do you want a mentor?"
+        self.yes_question.save()
+
+        response = self.client.post(self.url, {"question_id": self.initial_q.id, "answer": "yes"}, format="json")
+        self.assertEqual(response.data["question"], "Do you want a mentor?")
+
+    def test_fetch_question_with_malformed_id(self):
+        response = self.client.get(self.url, {"id": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_whole_tree(self):
+        response = self.client.get(reverse("questionnaire-tree"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["root"], self.initial_q.id)
+        self.assertIn("version", response.data)
+
+        questions = {question["id"]: question for question in response.data["questions"]}
+        self.assertEqual(len(questions), 3)
+        self.assertEqual(questions[self.initial_q.id], {
+            "id": self.initial_q.id,
+            "question": "Are you ready to return to work?",
+            "yes_next_q": self.yes_question.id,
+            "no_next_q": self.no_question.id,
+        })
+
+    def test_put_rejects_circular_questionnaire(self):
+        """Test a payload that loops back on itself is rejected without touching the saved questionnaire"""
+        data = {
+            "questions": [
+                {"id": 1, "question": "Do you eat today?", "yes_next_q": 2, "no_next_q": None},
+                {"id": 2, "question": "Was the food nice?", "yes_next_q": 3, "no_next_q": None},
+                {"id": 3, "question": "Do you want more?", "yes_next_q": None, "no_next_q": 1},
+            ]
+        }
+        response = self.client.put(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["cycle"], [1, 2, 3, 1])
+        self.assertEqual(Questionnaire.objects.count(), 3)
+
+    def questionnaire_payload(self):
+        return [
+            {"id": question.id, "question": question.question,
+             "yes_next_q": question.yes_next_q_id, "no_next_q": question.no_next_q_id}
+            for question in Questionnaire.objects.all()
+        ]
+
+    def test_put_only_touches_changed_questions(self):
+        questions = self.questionnaire_payload()
+        for question in questions:
+            if question["id"] == self.no_question.id:
+                question["question"] = "Do you feel anxious?"
+
+        # current questionnaire, then one bulk update inside a savepoint
+        with self.assertNumQueries(4):
+            response = self.client.put(self.url, data={"questions": questions}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"created": 0, "updated": 1, "deleted": 0})
+        self.assertEqual(Questionnaire.objects.get(id=self.no_question.id).question, "Do you feel anxious?")
+        self.assertEqual(Questionnaire.objects.get(id=self.initial_q.id).yes_next_q_id, self.yes_question.id)
+
+    def test_put_rejects_link_to_missing_question(self):
+        data = {"questions": [{"id": 1, "question": "Do you eat today?", "yes_next_q": 99, "no_next_q": None}]}
+        response = self.client.put(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["missing"], [99])
+        self.assertEqual(Questionnaire.objects.count(), 3)
+
+    def test_put_rejects_question_without_id(self):
+        data = {"questions": [{"question": "Do you eat today?", "yes_next_q": None, "no_next_q": None}]}
+        response = self.client.put(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Questionnaire.objects.count(), 3)
+
+    def test_put_is_all_or_nothing(self):
+        """Test a failure half way through leaves the previous questionnaire in place"""
+        questions = self.questionnaire_payload() + [
+            {"id": 100, "question": "Do you want a mentor?", "yes_next_q": None, "no_next_q": None}
+        ]
+        with patch("returnToWork.views.questionnaireViews.Questionnaire.objects.bulk_update", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.put(self.url, data={"questions": questions}, format="json")
+        self.assertEqual(Questionnaire.objects.count(), 3)
+        self.assertFalse(Questionnaire.objects.filter(id=100).exists())
+
+    def test_patch_adds_and_removes_questions(self):
+        data = {
+            "questions": [
+                {"id": self.no_question.id, "question": "Do you have anxiety?", "yes_next_q": 100, "no_next_q": None},
+                {"id": 100, "question": "Do you want a mentor?", "yes_next_q": None, "no_next_q": None},
+            ],
+            "deleted": [self.yes_question.id],
+        }
+        response = self.client.patch(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"created": 1, "updated": 2, "deleted": 1})
+
+        self.initial_q.refresh_from_db()
+        self.assertIsNone(self.initial_q.yes_next_q)
+        response = self.client.post(self.url, {"question_id": self.no_question.id, "answer": "yes"}, format="json")
+        self.assertEqual(response.data["question"], "Do you want a mentor?")
+
+    def test_patch_rejects_cycle_through_saved_questions(self):
+        data = {"questions": [{"id": self.no_question.id, "question": "Do you have anxiety?", "yes_next_q": self.initial_q.id, "no_next_q": None}]}
+        response = self.client.patch(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        cycle = response.data["cycle"]
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(set(cycle), {self.initial_q.id, self.no_question.id})
+        self.assertIsNone(Questionnaire.objects.get(id=self.no_question.id).yes_next_q)
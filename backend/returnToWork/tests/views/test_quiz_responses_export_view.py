@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+import uuid
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from returnToWork.models import User, Task, QuizQuestion, UserResponse, Module
+
+
+class AdminQuizResponsesExportViewTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='@adminuser',
+            email='admin@example.com',
+            password='adminpassword123',
+            first_name='Admin',
+            last_name='User',
+            user_type='admin'
+        )
+        self.service_user = User.objects.create_user(
+            username='@testuser',
+            email='test@example.com',
+            password='testpassword123',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.module = Module.objects.create(title='Test Module', description='A test module description')
+
+        self.task = Task.objects.create(
+            title='Export Quiz',
+            quiz_type='text_input',
+            author=self.admin_user,
+            moduleID=self.module
+        )
+        self.other_task = Task.objects.create(
+            title='Second Quiz',
+            quiz_type='text_input',
+            author=self.admin_user,
+            moduleID=self.module
+        )
+        self.question1 = QuizQuestion.objects.create(task=self.task, question_text='First question', order=1)
+        self.question2 = QuizQuestion.objects.create(task=self.task, question_text='Second question', order=2)
+        self.other_question = QuizQuestion.objects.create(task=self.other_task, question_text='Other question', order=1)
+
+        UserResponse.objects.create(user=self.service_user, question=self.question2, response_text='Answer, with comma')
+        UserResponse.objects.create(user=self.service_user, question=self.question1, response_text='First answer')
+        UserResponse.objects.create(user=self.service_user, question=self.other_question, response_text='Other answer')
+
+    def read_csv(self, response):
+        return list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_task_export_streams_csv(self):
+        """Test that a task export streams one CSV row per response in question order"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses_export', args=[str(self.task.contentID)])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        rows = self.read_csv(response)
+        self.assertEqual([row['response_text'] for row in rows], ['First answer', 'Answer, with comma'])
+        self.assertEqual(rows[0]['username'], self.service_user.username)
+        self.assertEqual(rows[0]['user_id'], str(self.service_user.user_id))
+
+    def test_task_export_streams_ndjson(self):
+        """Test that output=ndjson streams one JSON object per line"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses_export', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'output': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([r['question_text'] for r in records], ['First question', 'Second question'])
+        self.assertEqual(records[0]['task_id'], str(self.task.contentID))
+
+    def test_module_export_includes_every_task(self):
+        """Test that the module export covers all tasks in the module"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_module_quiz_responses_export', args=[self.module.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = self.read_csv(response)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['task_title'] for row in rows}, {'Export Quiz', 'Second Quiz'})
+
+    def test_service_user_access_denied(self):
+        """Test that service users cannot export responses"""
+        self.client.force_authenticate(user=self.service_user)
+        url = reverse('admin_quiz_responses_export', args=[str(self.task.contentID)])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_output_rejected(self):
+        """Test that an unknown output format returns a 400"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('admin_quiz_responses_export', args=[str(self.task.contentID)])
+        response = self.client.get(url, {'output': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_task_and_module_return_404(self):
+        """Test that exporting a nonexistent task or module returns a 404"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(reverse('admin_quiz_responses_export', args=[str(uuid.uuid4())]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(reverse('admin_module_quiz_responses_export', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
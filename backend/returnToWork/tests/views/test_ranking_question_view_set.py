@@ -37,6 +37,35 @@ class RankingQuestionViewSetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
+    def test_filter_ranking_questions(self):
+        """Test filtering ranking questions by module and publication state"""
+        other_module = Module.objects.create(title="Other Module", description="Other description")
+        published = RankingQuestion.objects.create(
+            title='Published Question', moduleID=other_module, author=self.user, tiers=['A'], is_published=True
+        )
+
+        response = self.client.get(self.list_url, {'moduleID': other_module.id})
+        self.assertEqual([question['contentID'] for question in response.data], [str(published.contentID)])
+
+        response = self.client.get(self.list_url, {'is_published': 'false'})
+        self.assertEqual([question['contentID'] for question in response.data], [str(self.ranking_question.contentID)])
+
+        response = self.client.get(self.list_url, {'is_published': 'maybe'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_paginate_ranking_questions(self):
+        """Test that ?limit= pages the list newest first"""
+        newer = RankingQuestion.objects.create(title='Newer Question', moduleID=self.module, author=self.user, tiers=['A'])
+
+        response = self.client.get(self.list_url, {'limit': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([question['contentID'] for question in response.data['results']], [str(newer.contentID)])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [question['contentID'] for question in response.data['results']], [str(self.ranking_question.contentID)]
+        )
+
     def test_create_ranking_question(self):
         """Test creating a new ranking question"""
         data = {
@@ -1,6 +1,7 @@
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from returnToWork.models import Module, Tags
 
 User = get_user_model()
 class ServiceUserListViewAPITest(APITestCase):
@@ -35,3 +36,17 @@ class ServiceUserListViewAPITest(APITestCase):
         self.assertEqual(response.status_code, 200)
         for user in response.data:
             self.assertIn("john", user["username"])
+
+    def test_list_service_users_in_fixed_number_of_queries(self):
+        module = Module.objects.create(title="Module", description="Description")
+        tag = Tags.objects.create(tag="anxiety")
+        for user in (self.user1, self.user2):
+            user.module.add(module)
+            user.tags.add(tag)
+
+        # users, verifications joined in, tags, modules and the modules' tags
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("service-users-list"))
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]["tags"], ["anxiety"])
+        self.assertIsNone(response.data[0]["is_verified"])
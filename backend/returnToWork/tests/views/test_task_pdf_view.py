@@ -1,12 +1,28 @@
+import shutil
+import tempfile
+import time
+
 from rest_framework.test import APITestCase
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from returnToWork.models import Task, QuizQuestion, UserResponse, Module
+from returnToWork.task_pdf import save_artifact
 from uuid import uuid4
 
 User = get_user_model()
 
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
 class TaskPdfViewTest(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
     def setUp(self):
         self.user = User.objects.create_user(
             username="@johndoe", 
@@ -68,3 +84,66 @@ class TaskPdfViewTest(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/pdf")
+
+    def test_pdf_built_from_one_answers_query(self):
+        for order in range(2, 12):
+            QuizQuestion.objects.create(task=self.task, question_text=f"Question {order}", order=order)
+        url = f"/api/download-completed-task/{self.task.contentID}/"
+        # Task, questions joined to the user's answers
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_long_answers_wrap_onto_multiple_pages(self):
+        self.response.response_text = "A long answer that needs wrapping. " * 400
+        self.response.save()
+        url = f"/api/download-completed-task/{self.task.contentID}/"
+        content = b"".join(self.client.get(url).streaming_content)
+        self.assertGreater(content.count(b"/Type /Page\n"), 1)
+
+    def test_rendered_pdf_is_reused_until_answers_change(self):
+        url = f"/api/download-completed-task/{self.task.contentID}/"
+        b"".join(self.client.get(url).streaming_content)
+        directory = f"task_pdfs/{self.user.pk}/{self.task.pk}"
+        first = default_storage.listdir(directory)[1]
+        self.assertEqual(len(first), 1)
+
+        b"".join(self.client.get(url).streaming_content)
+        self.assertEqual(default_storage.listdir(directory)[1], first)
+
+        self.response.response_text = "Better"
+        self.response.save()
+        b"".join(self.client.get(url).streaming_content)
+        second = default_storage.listdir(directory)[1]
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(second, first)
+
+    def test_saving_keeps_the_new_render_when_renders_overlap(self):
+        """Test a render saved twice, as by two concurrent requests, leaves exactly the named file in place"""
+        directory = f"task_pdfs/{self.user.pk}/{self.task.pk}"
+        default_storage.save(f"{directory}/older.pdf", ContentFile(b"old"))
+        name = f"{directory}/current.pdf"
+
+        save_artifact(name, b"new")
+        # a second render of the same answers finishing after the first
+        default_storage.save(name, ContentFile(b"new"))
+        save_artifact(name, b"new")
+
+        self.assertEqual(default_storage.listdir(directory)[1], ["current.pdf"])
+        with default_storage.open(name) as artifact:
+            self.assertEqual(artifact.read(), b"new")
+
+    @override_settings(TASK_PDF_RENDER_MODE="thread")
+    def test_background_render_returns_accepted_until_ready(self):
+        url = f"/api/download-completed-task/{self.task.contentID}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 202)
+        self.assertIn("Retry-After", response)
+
+        for _ in range(50):
+            response = self.client.get(url)
+            if response.status_code == 200:
+                break
+            time.sleep(0.1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
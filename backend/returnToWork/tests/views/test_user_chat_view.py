@@ -5,6 +5,8 @@ from django.contrib.auth import get_user_model
 from unittest.mock import patch
 from returnToWork.models import Conversation, Message  # adjust to your actual app name
 from returnToWork.serializers import MessageSerializer
+from returnToWork import realtime
+from django.test import override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 User = get_user_model()
@@ -40,13 +42,16 @@ class UserChatViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data["message"], "Unable to find conversation")
 
-    @patch("returnToWork.views.pusher.Pusher.trigger")  
+    @patch("pusher.Pusher.trigger")  
     def test_post_message_success(self, mock_trigger):
         data = {
             "message": "Hey there!"
         }
 
-        response = self.client.post(self.url, data)
+        # the event is published by a background worker once the message is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
+        realtime.get_publisher().flush()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(Message.objects.count(), 1)
@@ -63,4 +68,84 @@ class UserChatViewTests(APITestCase):
 
         self.assertGreaterEqual(response.status_code, 400)
 
-  
\ No newline at end of file
+  
+    def test_get_messages_after_id_returns_only_new_messages(self):
+        messages = [
+            Message.objects.create(conversation=self.conversation, sender=self.user, text_content=f"Message {index}")
+            for index in range(4)
+        ]
+
+        response = self.client.get(self.url, {"after": messages[1].id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m["text_content"] for m in response.data], ["Message 2", "Message 3"])
+
+        response = self.client.get(self.url, {"after": messages[3].id})
+        self.assertEqual(response.data, [])
+
+    def test_get_messages_after_invalid_id(self):
+        response = self.client.get(self.url, {"after": "latest"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_messages_after_message_from_another_conversation(self):
+        other = Conversation.objects.create(user=self.user)
+        foreign = Message.objects.create(conversation=other, sender=self.user, text_content="Elsewhere")
+
+        for after in (foreign.id, 999999):
+            response = self.client.get(self.url, {"after": after})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_messages_cursor_paginated_newest_first(self):
+        for index in range(5):
+            Message.objects.create(conversation=self.conversation, sender=self.user, text_content=f"Message {index}")
+
+        first = self.client.get(self.url, {"limit": 3})
+        self.assertEqual([m["text_content"] for m in first.data["results"]], ["Message 4", "Message 3", "Message 2"])
+
+        second = self.client.get(first.data["next"])
+        self.assertEqual([m["text_content"] for m in second.data["results"]], ["Message 1", "Message 0"])
+        self.assertIsNone(second.data["next"])
+
+    @patch("pusher.Pusher.trigger")
+    def test_post_message_updates_last_message(self, mock_trigger):
+        self.client.post(self.url, {"message": "Latest news"})
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.lastMessage, "Latest news")
+
+    @override_settings(REALTIME_BACKEND="local")
+    def test_event_published_only_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.client.post(self.url, {"message": "Queued"})
+        backend = realtime.get_publisher().backend
+        self.assertEqual(backend.events, [])
+
+        for callback in callbacks:
+            callback()
+        realtime.get_publisher().flush()
+
+        self.assertEqual(len(backend.events), 1)
+        channel, event, data = backend.events[0]
+        self.assertEqual(channel, f"chat-room-{self.room_id}")
+        self.assertEqual(event, "new-message")
+        self.assertEqual(data["message"], "Queued")
+
+    @override_settings(REALTIME_BACKEND="sse")
+    def test_server_sent_events_stream(self):
+        url = reverse("user-chat-events", kwargs={"room_id": self.room_id})
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b": connected\n\n")
+
+        realtime.get_publisher().backend.publish_batch([(f"chat-room-{self.room_id}", "new-message", {"message": "Hi"})])
+        self.assertEqual(next(stream), b'event: new-message\ndata: {"message": "Hi"}\n\n')
+        response.close()
+
+    def test_server_sent_events_disabled_for_other_backends(self):
+        url = reverse("user-chat-events", kwargs={"room_id": self.room_id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -83,3 +83,61 @@ class UserDetailTests(APITestCase):
         response = self.client.put(self.url, data, format="json")
         self.assertEqual(response.status_code, 404)
         self.assertIn("Module ID not found.", response.data["detail"])
+
+    def test_put_only_changes_rows_that_differ(self):
+        """Test PUT keeps existing tag and module rows and replaces the rest"""
+        self.user.tags.add(self.tag1)
+        self.user.module.add(self.module1)
+        kept_tag_row = User.tags.through.objects.get(user=self.user, tags=self.tag1).id
+        module3 = Module.objects.create(title="Module 3", description="Test 3")
+
+        data = {
+            "user_id": str(self.user.user_id),
+            "is_first_login": False,
+            "tags": [{"id": self.tag1.id, "tag": self.tag1.tag}, {"id": self.tag2.id, "tag": self.tag2.tag}],
+            "module": [{"id": self.module2.id}, {"id": module3.id}]
+        }
+        response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(User.tags.through.objects.get(user=self.user, tags=self.tag1).id, kept_tag_row)
+        self.assertEqual(set(self.user.tags.all()), {self.tag1, self.tag2})
+        self.assertEqual(set(self.user.module.all()), {self.module2, module3})
+
+    def test_put_query_count_does_not_grow_with_selections(self):
+        """Test PUT resolves tags and modules with one query each"""
+        tags = [Tags.objects.create(tag=f"tag{i}") for i in range(10)]
+        modules = [Module.objects.create(title=f"Module {i}", description="Test") for i in range(10)]
+        data = {
+            "user_id": str(self.user.user_id),
+            "is_first_login": False,
+            "tags": [{"id": tag.id, "tag": tag.tag} for tag in tags],
+            "module": [{"id": module.id} for module in modules]
+        }
+
+        # user lookup, tag and module lookups, current tag and module rows, two inserts and the user update
+        # inside a savepoint, then the user, tags, modules and module tags for the response
+        with self.assertNumQueries(14):
+            response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.user.tags.count(), 10)
+        self.assertEqual(self.user.module.count(), 10)
+
+    def test_put_lists_missing_tags_and_modules(self):
+        """Test PUT reports every unknown tag and module ID"""
+        data = {
+            "user_id": str(self.user.user_id),
+            "is_first_login": False,
+            "tags": [{"id": 1, "tag": "missing"}, {"id": self.tag1.id, "tag": self.tag1.tag}],
+            "module": [{"id": self.module1.id}]
+        }
+        response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["missing_tags"], ["missing"])
+
+        data["tags"] = []
+        data["module"] = [{"id": 999998}, {"id": self.module1.id}, {"id": 999999}]
+        response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["missing_module_ids"], [999998, 999999])
+        self.assertFalse(self.user.module.exists())
@@ -82,3 +82,53 @@
 #         data = {'hasLiked': True, 'pinned': True}
 #         response = self.client.post(self.url, data, format='json')
 #         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from returnToWork.models import Module, ProgressTracker
+
+User = get_user_model()
+
+class UserInteractionLikeTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='@testuser',
+            password='pass',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            user_type='service user'
+        )
+        self.module = Module.objects.create(title='Sample Module', description='Test module')
+        self.url = reverse('user-interaction', args=[self.module.id])
+        self.client.force_authenticate(user=self.user)
+
+    def test_like_is_counted_once(self):
+        for _ in range(3):
+            response = self.client.post(self.url, {'hasLiked': True, 'pinned': True}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 1)
+        tracker = ProgressTracker.objects.get(user=self.user, module=self.module)
+        self.assertTrue(tracker.hasLiked)
+        self.assertTrue(tracker.pinned)
+
+    def test_unlike_removes_the_vote(self):
+        self.client.post(self.url, {'hasLiked': True, 'pinned': False}, format='json')
+        self.client.post(self.url, {'hasLiked': False, 'pinned': False}, format='json')
+        self.client.post(self.url, {'hasLiked': False, 'pinned': False}, format='json')
+
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 0)
+        self.assertFalse(ProgressTracker.objects.get(user=self.user, module=self.module).hasLiked)
+
+    def test_invalid_data_does_not_count_the_like(self):
+        response = self.client.post(self.url, {'hasLiked': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.upvotes, 0)
+        self.assertFalse(ProgressTracker.objects.get(user=self.user, module=self.module).hasLiked)
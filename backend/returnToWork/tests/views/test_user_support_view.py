@@ -2,7 +2,7 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from returnToWork.models import Conversation  # adjust to your actual import path
+from returnToWork.models import Conversation, Message  # adjust to your actual import path
 from django.utils import timezone
 
 User = get_user_model()
@@ -41,4 +41,45 @@ class UserSupportViewTests(APITestCase):
         response = self.client.post(self.url_, {})
         self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
 
-    
\ No newline at end of file
+    
+    def test_admin_inbox_uses_fixed_number_of_queries(self):
+        self.client.force_authenticate(user=self.admin_user)
+        for index in range(5):
+            owner = User.objects.create_user(username=f'owner{index}', password='password123', user_type='service user', email=f'owner{index}@gmail.com')
+            conversation = Conversation.objects.create(user=owner)
+            Message.objects.create(conversation=conversation, sender=owner, text_content=f'Help {index}')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url_)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual({chat['user_username'] for chat in response.data}, {f'owner{index}' for index in range(5)})
+
+    def test_unread_count_and_last_message(self):
+        conversation = Conversation.objects.create(user=self.service_user, admin=self.admin_user, hasEngaged=True)
+        Message.objects.create(conversation=conversation, sender=self.service_user, text_content='My question')
+        Message.objects.create(conversation=conversation, sender=self.admin_user, text_content='First reply')
+        Message.objects.create(conversation=conversation, sender=self.admin_user, text_content='Second reply')
+
+        chat = self.client.get(self.url_).data[0]
+        self.assertEqual(chat['user_username'], self.service_user.username)
+        self.assertEqual(chat['unread_count'], 2)
+        self.assertEqual(chat['last_message_preview'], 'Second reply')
+
+        self.client.get(reverse('user-chat-view', kwargs={'room_id': conversation.id}))
+        self.assertEqual(self.client.get(self.url_).data[0]['unread_count'], 0)
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(self.url_).data[0]['unread_count'], 1)
+
+    def test_keyset_pagination_with_limit(self):
+        conversations = [Conversation.objects.create(user=self.service_user) for _ in range(3)]
+
+        first = self.client.get(self.url_, {'limit': 2})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([chat['id'] for chat in first.data['results']], [conversations[2].id, conversations[1].id])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual([chat['id'] for chat in second.data['results']], [conversations[0].id])
+        self.assertIsNone(second.data['next'])
@@ -1,28 +1,31 @@
-from django.core.cache import cache
+from unittest.mock import patch
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from returnToWork.models import PendingSignup
 
 User = get_user_model()
 
 class VerifyEmailViewTests(APITestCase):
     def setUp(self):
-        self.token = 'test-token-123'
         self.user_data = {
             'username': '@johndoe',
             'email': 'johndoe@example.com',
             'password': 'testpass123'
         }
-        cache.set(self.token, self.user_data, timeout=300)
+        self.pending_signup = PendingSignup.create_for(self.user_data)
+        self.token = self.pending_signup.token
 
     def test_verify_email_success(self):
         url = reverse('verify-sign-up', kwargs={'token': self.token})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['message'], 'Email verified successfully')
-        self.assertTrue(User.objects.filter(username='@johndoe').exists())
-        self.assertIsNone(cache.get(self.token))
+        user = User.objects.get(username='@johndoe')
+        self.assertTrue(user.check_password('testpass123'))
+        self.assertFalse(PendingSignup.objects.filter(token=self.token).exists())
 
     def test_verify_email_invalid_token(self):
         url = reverse('verify-sign-up', kwargs={'token': 'invalid-token'})
@@ -36,4 +39,35 @@ class VerifyEmailViewTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['message'], 'This email is already verified. You can log in')
-        self.assertEqual(User.objects.filter(email=self.user_data['email']).count(), 1)
\ No newline at end of file
+        self.assertEqual(User.objects.filter(email=self.user_data['email']).count(), 1)
+
+    def test_password_is_not_stored_in_plain_text(self):
+        self.assertNotIn('testpass123', self.pending_signup.password)
+        self.assertNotIn('password', self.pending_signup.user_data)
+
+    def test_verify_email_expired_token(self):
+        PendingSignup.objects.filter(pk=self.pending_signup.pk).update(expires_at=timezone.now())
+        url = reverse('verify-sign-up', kwargs={'token': self.token})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(username='@johndoe').exists())
+
+    def test_concurrent_verification_creates_user_once(self):
+        """Test the second of two simultaneous clicks on the link does not try to create the user again"""
+        first = PendingSignup.get_valid(self.token)
+        second = PendingSignup.get_valid(self.token)
+
+        self.assertIsNotNone(first.create_user())
+        self.assertIsNone(second.create_user())
+        self.assertEqual(User.objects.filter(username='@johndoe').count(), 1)
+
+    def test_verify_email_link_consumed_by_concurrent_request(self):
+        stale = PendingSignup.get_valid(self.token)
+        stale.create_user()
+        # as if this request passed the existing email check just before the other one committed
+        User.objects.filter(username='@johndoe').delete()
+
+        with patch.object(PendingSignup, 'get_valid', return_value=stale):
+            response = self.client.get(reverse('verify-sign-up', kwargs={'token': self.token}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'This email is already verified. You can log in')
@@ -1,5 +1,4 @@
 from django.db.models import Q
-from django.core.mail import send_mail
 
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -7,10 +6,13 @@ from rest_framework.permissions import AllowAny
 
 from returnToWork.models import User
 from returnToWork.serializers import UserSerializer, AdminUserSerializer
+from returnToWork.outbox import queue_mail
+from returnToWork.response_cache import cache_response
 
 class ServiceUserListView(generics.ListAPIView):
     """API view to get all service users"""
     serializer_class = UserSerializer
+    cursor_ordering = ('username',)
 
     def get_queryset(self):
         queryset = User.objects.filter(user_type="service user")
@@ -18,17 +20,23 @@ class ServiceUserListView(generics.ListAPIView):
         username = self.request.query_params.get("username", None)
         if username:
             queryset = queryset.filter(username__icontains=username)
-        return queryset.prefetch_related("tags")  # Prefetch tags for efficiency
+        return UserSerializer.eager_load(queryset)
 
 class AdminUserListView(generics.ListAPIView):
     serializer_class = AdminUserSerializer
+    pagination_class = None  # a handful of admins, loaded whole for pickers
+    filter_fields = ('user_type',)
+
+    @cache_response('admin_users')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
         # Return superadmins and verified admins only
-        return User.objects.filter(
+        return AdminUserSerializer.eager_load(User.objects.filter(
             Q(user_type='superadmin') |
             Q(user_type='admin', verification__is_verified=True)
-        )
+        ))
 
 class DeleteServiceUserView(generics.DestroyAPIView):
     """API view to delete a user by username"""
@@ -38,12 +46,11 @@ class DeleteServiceUserView(generics.DestroyAPIView):
         try:
             user = User.objects.get(username=username)
             user_email = user.email
-            send_mail(
+            queue_mail(
             subject= "Account deletion",
             message = f"Dear {username}, Your account has been deleted by the admin",
             from_email = "readiness.to.return.to.work@gmail.com",
             recipient_list=[user_email],
-            fail_silently=False,
             )
             user.delete()
             return Response({"message": f"User with username \"{username}\" has been deleted."}, status=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,5 @@
 from django.contrib.auth import get_user_model, login, logout
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.core.files.storage import default_storage
 from django.shortcuts import get_object_or_404
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
@@ -10,14 +9,14 @@ from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.core.cache import cache
 from rest_framework_simplejwt.tokens import RefreshToken
 import uuid
 
 
 from returnToWork.models import (
-User, AdminVerification
+User, AdminVerification, PendingSignup
 )
+from returnToWork.outbox import queue_mail
 from returnToWork.serializers import (
     LogInSerializer,PasswordResetSerializer, RequestPasswordResetSerializer, 
     SignUpSerializer,
@@ -60,12 +59,11 @@ class LogInView(APIView):
                 )
 
                 verification_url = f"http://localhost:5173/verify-admin-email/{verification_token}/"
-                send_mail(
+                queue_mail(
                     subject="Verify your admin account",
                     message=f"Dear {user.first_name},\n\nPlease verify your email by clicking the following link: {verification_url}\n\nThis link will expire in 3 days.",
                     from_email="readiness.to.return.to.work@gmail.com",
                     recipient_list=[user.email],
-                    fail_silently=False,
                 )
 
                 return Response({
@@ -93,13 +91,15 @@ class LogInView(APIView):
 
 class VerifyEmailView(APIView):
     def get(self,request,token):
-        user_data = cache.get(token)
-        if not user_data:
+        pending_signup = PendingSignup.get_valid(token)
+        if not pending_signup:
             return Response({"error": "Invalid or expired verification token"}, status = status.HTTP_400_BAD_REQUEST)
-        if User.objects.filter(email=user_data.get("email")).exists():
+        if User.objects.filter(email=pending_signup.email).exists():
+            pending_signup.delete()
+            return Response({"message": "This email is already verified. You can log in"}, status=status.HTTP_200_OK)
+        if pending_signup.create_user() is None:
+            # the same link was used by a concurrent request, which created the user
             return Response({"message": "This email is already verified. You can log in"}, status=status.HTTP_200_OK)
-        user = User.objects.create_user(**user_data)
-        cache.delete(token)
         return Response({"message":"Email verified successfully"}, status=status.HTTP_200_OK)
 
 class PasswordResetView(APIView):
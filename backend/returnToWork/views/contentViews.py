@@ -3,6 +3,7 @@ import uuid
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.db.models import Q
 
 from rest_framework.views import APIView
@@ -15,8 +16,25 @@ from returnToWork.models import (
     RankingQuestion, ContentProgress, ProgressTracker, User
 )
 from returnToWork.serializers import (
-    ContentPublishSerializer, ProgressTrackerSerializer
+    ContentPublishSerializer, ProgressTrackerSerializer, ImageSerializer, AudioClipSerializer,
+    DocumentSerializer, EmbeddedVideoSerializer, TaskSerializer, RankingQuestionSerializer,
+    module_content_serializer
 )
+from returnToWork.manifest import get_module_manifest
+from returnToWork.filters import FieldFilterBackend
+from returnToWork.pagination import DefaultCursorPagination
+
+# Map content_type_name to model
+CONTENT_TYPE_MAP = {
+    'video': EmbeddedVideo,
+    'quiz': Task,  # Assuming quizzes are stored in Task model
+    #'document' : Document, (im confused here)
+    'infosheet' : Document,
+    'image' : Image,
+    'audio' : AudioClip,
+    'ranking' : RankingQuestion
+
+}
 
 class MarkContentViewedView(APIView):
     """
@@ -42,25 +60,13 @@ class MarkContentViewedView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Map content_type_name to model
-        content_type_map = {
-            'video': EmbeddedVideo,
-            'quiz': Task,  # Assuming quizzes are stored in Task model
-            #'document' : Document, (im confused here)
-            'infosheet' : Document,
-            'image' : Image,
-            'audio' : AudioClip,
-            'ranking' : RankingQuestion
-
-        }
-        
-        if content_type_name not in content_type_map:
+        if content_type_name not in CONTENT_TYPE_MAP:
             return Response(
                 {"error": f"Invalid content_type: {content_type_name}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        model = content_type_map[content_type_name]
+        model = CONTENT_TYPE_MAP[content_type_name]
         content_type = ContentType.objects.get_for_model(model)
         
         # Try to convert string ID to UUID
@@ -84,7 +90,6 @@ class MarkContentViewedView(APIView):
             )
         
         # Create or update progress
-
         progress, created = ContentProgress.objects.get_or_create(
             user=request.user,
             content_type=content_type,
@@ -92,16 +97,11 @@ class MarkContentViewedView(APIView):
             defaults={'viewed': True, 'viewed_at': timezone.now()}
         )
         
+        # Update module progress tracker, counting the item only the first time it is viewed
         if not created and not progress.viewed:
-            progress.mark_as_viewed()
-        
-        # Update module progress tracker
-        module = content_object.moduleID
-        progress_tracker, _ = ProgressTracker.objects.get_or_create(
-            user=request.user,
-            module=module
-        )
-        progress_tracker.update_progress()
+            progress_tracker = progress.mark_as_viewed()
+        else:
+            progress_tracker = ProgressTracker.record_view(request.user, content_object.moduleID_id, newly_viewed=created)
         
         # Return success response
         return Response({
@@ -125,31 +125,78 @@ class CompletedContentView(APIView):
     def get(self, request, module_id):
         module = get_object_or_404(Module, pk=module_id)
         
-        # Get content types for all content models
-        content_models = [Document, EmbeddedVideo, Task, AudioClip, Image, RankingQuestion]
-        content_types = [ContentType.objects.get_for_model(model) for model in content_models]
-        
-        # Get content IDs for this module
-        module_content_ids = []
-        for model in content_models:
-            module_content_ids.extend(
-                model.objects.filter(moduleID=module).values_list('contentID', flat=True)
-            )
+        # Get content types and IDs for this module from the cached manifest
+        manifest = get_module_manifest(module)
         
         # Get viewed content
         viewed_content = ContentProgress.objects.filter(
             user=request.user,
-            content_type__in=content_types,
-            object_id__in=module_content_ids,
+            content_type__in={entry.content_type for entry in manifest},
+            object_id__in=[entry.content_id for entry in manifest],
             viewed=True
         ).values_list('object_id', flat=True)
         
         return Response(list(viewed_content))
     
 
+class ModuleContentsView(APIView):
+    """
+    API view to get every published content item of a module as one stream ordered by order_index,
+    with the caller's viewed flags. Replaces the separate per-type module endpoints.
+    """
+    permission_classes = [IsAuthenticated]
+
+    serializer_classes = {
+        Image: module_content_serializer(ImageSerializer),
+        AudioClip: module_content_serializer(AudioClipSerializer),
+        Document: module_content_serializer(DocumentSerializer),
+        EmbeddedVideo: module_content_serializer(EmbeddedVideoSerializer),
+        Task: module_content_serializer(TaskSerializer),
+        RankingQuestion: module_content_serializer(RankingQuestionSerializer),
+    }
+
+    def get(self, request, module_id):
+        module = get_object_or_404(Module, pk=module_id)
+        manifest = [entry for entry in get_module_manifest(module) if entry.is_published]
+
+        # One query per content type that actually appears in the module
+        present_types = {entry.content_type for entry in manifest}
+        items = {}
+        for content_type_name, model in CONTENT_TYPE_MAP.items():
+            if ContentType.objects.get_for_model(model).id not in present_types:
+                continue
+
+            objects = model.objects.filter(moduleID=module, is_published=True).select_related('author')
+            for data in self.serializer_classes[model](objects, many=True, context={'request': request}).data:
+                items[str(data['contentID'])] = {**data, 'content_type': content_type_name}
+
+        viewed = {
+            str(object_id) for object_id in ContentProgress.objects.filter(
+                user=request.user,
+                object_id__in=[entry.content_id for entry in manifest],
+                viewed=True
+            ).values_list('object_id', flat=True)
+        }
+
+        # Merge in manifest order, skipping anything published after the manifest was read
+        contents = []
+        for entry in manifest:
+            item = items.get(str(entry.content_id))
+            if item:
+                item['viewed'] = str(entry.content_id) in viewed
+                contents.append(item)
+
+        return Response({
+            'module_id': module.id,
+            'title': module.title,
+            'contents': contents
+        }, status=status.HTTP_200_OK)
+
+
 class UserInteractionView(APIView):
 
     permission_classes = [IsAuthenticated]
+    filter_fields = ('module',)
 
     def get(self, request):
         user = request.user
@@ -157,6 +204,12 @@ class UserInteractionView(APIView):
         option = request.query_params.get("filter")
 
         allInteracts = ProgressTracker.objects.filter(user=user) if option == "user" else ProgressTracker.objects.all()
+        allInteracts = FieldFilterBackend().filter_queryset(request, allInteracts, self)
+
+        paginator = DefaultCursorPagination()
+        page = paginator.paginate_queryset(allInteracts, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(ProgressTrackerSerializer(page, many=True).data)
 
         if allInteracts:
              serializedInf = ProgressTrackerSerializer(allInteracts,many=True)
@@ -175,26 +228,26 @@ class UserInteractionView(APIView):
         if module:
 
             try:
-                tracker, created = ProgressTracker.objects.get_or_create(
-                                user=user, 
-                                module=module,
+                tracker, created = ProgressTracker.get_or_create_initialised(
+                                user,
+                                module,
                                 defaults={
                                     'hasLiked': False,
                                     'pinned': False
                                 }
                             )
-                # Handle upvote/downvote logic
-                if( (data["hasLiked"]) and (((not created)  and ( not tracker.hasLiked)) or (created))):
-                    module.upvote()
-                elif( (not data["hasLiked"]) and (not created ) and (tracker.hasLiked)):
-                    module.downvote()
-
-
-                tracker.pinned = data["pinned"]
-                tracker.hasLiked = data["hasLiked"]
-                tracker.save()
-
-                module.save()
+                liked = bool(data["hasLiked"])
+                with transaction.atomic():
+                    # only the request that actually flips hasLiked moves the counter, so repeated
+                    # or concurrent likes from the same user are counted once
+                    flipped = ProgressTracker.objects.filter(pk=tracker.pk, hasLiked=not liked).update(hasLiked=liked)
+                    if flipped:
+                        if liked:
+                            module.upvote()
+                        else:
+                            module.downvote()
+
+                    ProgressTracker.objects.filter(pk=tracker.pk).update(pinned=data["pinned"])
 
             except:
                 return Response({"message": "sent data formatted incorrectly!"}, status=status.HTTP_400_BAD_REQUEST)
@@ -224,10 +277,17 @@ class ContentPublishView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class ProgressTrackerView(APIView):
+    filter_fields = ('user', 'module')
 
     def get(self, request):
+        # ?user= and ?module= narrow the trackers, and ?limit= pages through them instead of sending every user's
+        progressTrackerObjects = FieldFilterBackend().filter_queryset(request, ProgressTracker.objects.all(), self)
+
+        paginator = DefaultCursorPagination()
+        page = paginator.paginate_queryset(progressTrackerObjects, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(ProgressTrackerSerializer(page, many=True).data)
 
-        progressTrackerObjects = ProgressTracker.objects.all() #(filter user request and commpleted = true)
         serializer = ProgressTrackerSerializer(progressTrackerObjects,many = True)
         return Response(serializer.data)
     
@@ -19,10 +19,16 @@ from returnToWork.serializers import (
     EmbeddedVideoSerializer, TagSerializer, ModuleSerializer, 
     TaskSerializer, RankingQuestionSerializer
 )
+from returnToWork.response_cache import cache_response, get_group_version
+from returnToWork.conditional import ConditionalGetMixin
+from returnToWork.feed import get_module_feed
+from returnToWork.pagination import ModuleFeedPagination
 
-class ImageViewSet(viewsets.ModelViewSet):
+class ImageViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
     parser_classes = (MultiPartParser, FormParser)
 
     def get_queryset(self):
@@ -119,9 +125,11 @@ class ImageViewSet(viewsets.ModelViewSet):
         serializer = ImageSerializer(image)
         return Response(serializer.data)
 
-class AudioClipViewSet(viewsets.ModelViewSet):
+class AudioClipViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = AudioClip.objects.all()
     serializer_class = AudioClipSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -231,9 +239,11 @@ class AudioClipViewSet(viewsets.ModelViewSet):
         else:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -324,9 +334,11 @@ class DocumentViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
 
-class EmbeddedVideoViewSet(viewsets.ModelViewSet):
+class EmbeddedVideoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = EmbeddedVideo.objects.all()
     serializer_class = EmbeddedVideoSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -410,16 +422,39 @@ class TagViewSet(viewsets.ModelViewSet):
     queryset = Tags.objects.all()
     serializer_class = TagSerializer
 
-class ModuleViewSet(viewsets.ModelViewSet):
+    @cache_response('tags')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class ModuleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
 
-class TaskViewSet(viewsets.ModelViewSet):
+    def get_validator_source(self, queryset):
+        # Modules have no updated_at; the response cache version changes whenever a module or its tags do
+        return str(get_group_version('modules')), None
+
+    @cache_response('modules')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def feed(self, request):
+        """Modules ranked for the current user, so the client no longer sorts the whole catalogue itself"""
+        paginator = ModuleFeedPagination()
+        page = paginator.paginate_queryset(get_module_feed(request.user), request, view=self)
+        return paginator.get_paginated_response(page)
+
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
 
-class RankingQuestionViewSet(viewsets.ModelViewSet):
+class RankingQuestionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = RankingQuestion.objects.all()
     serializer_class = RankingQuestionSerializer
+    filter_fields = ('moduleID', 'author', 'is_published')
+    cursor_ordering = ('-created_at', '-pk')
     def perform_create(self, serializer): # Automatically set the authenticated user as the author when a new ranking question is created
         serializer.save(author=self.request.user)
@@ -1,9 +1,50 @@
+from django.db import transaction
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from returnToWork.models import Questionnaire
-from returnToWork.serializers import QuestionnaireSerializer
+from returnToWork.questionnaire_tree import get_questionnaire_tree
+from returnToWork.questionnaire_validation import parse_questions, validate_graph
+from returnToWork.response_cache import invalidate
+
+
+def load_questionnaire():
+    """Return the saved questionnaire as {id: (question, yes_next_q, no_next_q)} with one query"""
+    return {row[0]: row[1:] for row in Questionnaire.objects.values_list('id', 'question', 'yes_next_q', 'no_next_q')}
+
+
+def apply_questionnaire(nodes):
+    """
+    Make the saved questionnaire match nodes, touching only questions that differ. Runs in one
+    transaction, so readers keep seeing the previous questionnaire until the new one is complete:
+    removed questions are deleted, new ones are bulk created without links, then the links and
+    text of every new or changed question are set with a single bulk update.
+    """
+    with transaction.atomic():
+        existing = load_questionnaire()
+
+        removed = existing.keys() - nodes.keys()
+        if removed:
+            Questionnaire.objects.filter(id__in=removed).delete()
+
+        added = [question_id for question_id in nodes if question_id not in existing]
+        Questionnaire.objects.bulk_create([Questionnaire(id=question_id, question=nodes[question_id][0]) for question_id in added])
+
+        changed = [
+            Questionnaire(id=question_id, question=text, yes_next_q_id=yes_id, no_next_q_id=no_id)
+            for question_id, (text, yes_id, no_id) in nodes.items()
+            if existing.get(question_id, (text, None, None)) != (text, yes_id, no_id)
+        ]
+        Questionnaire.objects.bulk_update(changed, ['question', 'yes_next_q', 'no_next_q'])
+
+        # bulk operations bypass the model signals that normally expire the compiled tree
+        invalidate('questionnaire')
+
+    updated = sum(1 for question in changed if question.id in existing)
+    return {"created": len(added), "updated": updated, "deleted": len(removed)}
+
 
 class QuestionnaireView(APIView):
     """API to fetch questions dynamically based on answers"""
@@ -11,70 +52,90 @@ class QuestionnaireView(APIView):
     def get(self, request, *args, **kwargs):
         """Fetch the first question or a specific question"""
         question_id = request.query_params.get("id")
+        tree = get_questionnaire_tree()
 
         # checks if id was provided
         if question_id:
+            # tries to fetch the relevant question...
             try:
-                # tries to fetch the relevant question...
-                question = Questionnaire.objects.get(id=question_id)
-                serializer = QuestionnaireSerializer(question)
-                # and returns the data in JSON format
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            except Questionnaire.DoesNotExist:
+                question = tree.get(int(question_id))
+            except ValueError:
+                question = None
+            if question is None:
                 # ...returns error if it cant be found
                 return Response({"error": "Question not found"}, status=status.HTTP_404_NOT_FOUND)
+            # and returns the data in JSON format
+            return Response(question._asdict(), status=status.HTTP_200_OK)
         else:
-            # fetches the first question, if id not provided
-            first_question = Questionnaire.objects.get(question="Are you ready to return to work?")
-            serializer = QuestionnaireSerializer(first_question)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            # fetches the first question, the one no other question leads to, if id not provided
+            if tree.root is None:
+                return Response({"error": "Question not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response(tree.root._asdict(), status=status.HTTP_200_OK)
 
     def post(self, request, *args, **kwargs):
         """Get next question based on user's answer"""
 
         question_id = request.data.get("question_id")
         answer = request.data.get("answer")  # Expected: "yes" or "no"
+        tree = get_questionnaire_tree()
 
-        
+        #  checks if id given is an aqual question
         try:
-            #  checks if id given is an aqual question
-            question = Questionnaire.objects.get(id=question_id)
-            
-            if answer:
-                next_question = question.yes_next_q if answer.lower() == "yes" else question.no_next_q
-            else:
-                return Response({"error": "Missing Answer"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            
-            if next_question:
-                # checks if there is a follow up question to display
-                serializer = QuestionnaireSerializer(next_question)
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            else:
-                # if not, then flag that end of the questionnaire has been reached
-                return Response({"message": "End of questionnaire"}, status=status.HTTP_200_OK)
-        except Questionnaire.DoesNotExist:
+            question = tree.get(int(question_id))
+        except (TypeError, ValueError):
+            question = None
+        if question is None:
             # returns error if not (realistically should never run)
             return Response({"error": "Invalid question"}, status=status.HTTP_400_BAD_REQUEST)
-        
+
+        if not answer:
+            return Response({"error": "Missing Answer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_question = tree.next_question(question.id, answer.lower())
+        if next_question:
+            # checks if there is a follow up question to display
+            return Response(next_question._asdict(), status=status.HTTP_200_OK)
+        else:
+            # if not, then flag that end of the questionnaire has been reached
+            return Response({"message": "End of questionnaire"}, status=status.HTTP_200_OK)
 
     def put(self, request):
-        questions = request.data.get("questions")
-        Questionnaire.objects.all().delete()
-        
-        if(questions):
-            for qObj in reversed(questions):
-
-        
-                Questionnaire.objects.create(
-                    id = qObj.get('id'),
-                    question = qObj.get('question'),
-                    yes_next_q= Questionnaire.objects.filter(id = qObj.get('yes_next_q')).first(),
-                    no_next_q = Questionnaire.objects.filter(id = qObj.get('no_next_q')).first()
-                    
-                )
-
-        print("The questions are successfully saved")
-     
-
-        return Response("", status=status.HTTP_200_OK)
+        """Replace the whole questionnaire with the given questions"""
+        nodes, error = parse_questions(request.data.get("questions") or [])
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        return self.save_questionnaire(nodes)
+
+    def patch(self, request):
+        """Add or change the given questions and remove the ones listed in "deleted", leaving the rest as they are"""
+        changes, error = parse_questions(request.data.get("questions") or [])
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        deleted = request.data.get("deleted") or []
+        if not isinstance(deleted, list) or not all(isinstance(question_id, int) for question_id in deleted):
+            return Response({"error": "deleted must be a list of question ids"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # like the model's SET_NULL, saved questions that led to a deleted one become leaves on that answer
+        deleted = set(deleted)
+        nodes = {
+            question_id: (text, None if yes_id in deleted else yes_id, None if no_id in deleted else no_id)
+            for question_id, (text, yes_id, no_id) in load_questionnaire().items()
+            if question_id not in deleted
+        }
+        nodes.update(changes)
+        return self.save_questionnaire(nodes)
+
+    def save_questionnaire(self, nodes):
+        # everything is validated before a single row is written
+        error = validate_graph(nodes)
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        counts = apply_questionnaire(nodes)
+        return Response(counts, status=status.HTTP_200_OK)
+
+
+class QuestionnaireTreeView(APIView):
+    """API to fetch the whole questionnaire at once, so the client can walk it without further requests"""
+    def get(self, request):
+        return Response(get_questionnaire_tree().as_dict(), status=status.HTTP_200_OK)
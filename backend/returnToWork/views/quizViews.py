@@ -1,14 +1,23 @@
+import csv
+import json
 import uuid
+from collections import defaultdict
 
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status, viewsets
 
-from returnToWork.models import Task, QuizQuestion, UserResponse
+from returnToWork.models import Module, Task, QuizQuestion, UserResponse
 from returnToWork.serializers import QuizQuestionSerializer
+from returnToWork.pagination import QuizResponseCursorPagination
 
 # API View to fetch quiz details and handle quiz responses
 class QuizDetailView(APIView):
@@ -59,25 +68,13 @@ class QuizResponseView(APIView):
 
             question = QuizQuestion.objects.get(id=question_id)
 
-            # Check if a response already exists
-            existing_response = UserResponse.objects.filter(
+            # Update the existing response or create one; the (user, question) constraint keeps double submits from duplicating it
+            user_response, _ = UserResponse.objects.update_or_create(
                 user=request.user,
-                question=question
-            ).first()
-
-            if existing_response:
-                # Update existing response
-                existing_response.response_text = response_text
-                existing_response.save()
-                response_id = existing_response.id
-            else:
-                # Create new response
-                new_response = UserResponse.objects.create(
-                    user=request.user,
-                    question=question,
-                    response_text=response_text
-                )
-                response_id = new_response.id
+                question=question,
+                defaults={'response_text': response_text, 'submitted_at': timezone.now()}
+            )
+            response_id = user_response.id
 
             # Content progress is only updated on MarkContentViewed
             return Response({
@@ -96,6 +93,52 @@ class QuizResponseView(APIView):
                     'message': f'Error saving response: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class BulkQuizResponseView(APIView):
+    """Save every answer to a quiz in one request and one upsert statement"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        task_id = request.data.get('task_id')
+        answers = request.data.get('answers')
+
+        if not task_id or not isinstance(answers, dict) or not answers:
+            return Response({'status': 'error', 'message': 'task_id and a non-empty answers object are required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            answers = {int(question_id): '' if text is None else str(text) for question_id, text in answers.items()}
+            task = Task.objects.get(contentID=task_id)
+        except (ValueError, TypeError, ValidationError):
+            return Response({'status': 'error', 'message': 'Invalid task or question ID'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Task.DoesNotExist:
+            return Response({'status': 'error', 'message': 'Task not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        valid_ids = set(QuizQuestion.objects.filter(task=task, id__in=answers).values_list('id', flat=True))
+        invalid_ids = sorted(answers.keys() - valid_ids)
+        if invalid_ids:
+            return Response({'status': 'error', 'message': 'Questions not found in this quiz', 'invalid_question_ids': invalid_ids},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # edited answers get a fresh submitted_at, so incremental ?since= syncs pick them up
+        now = timezone.now()
+        UserResponse.objects.bulk_create(
+            [
+                UserResponse(user=request.user, question_id=question_id, response_text=text, submitted_at=now)
+                for question_id, text in answers.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['user', 'question'],
+            update_fields=['response_text', 'submitted_at'],
+        )
+
+        return Response({
+            'status': 'success',
+            'task_id': str(task.contentID),
+            'saved': len(answers)
+        }, status=status.HTTP_200_OK)
+
 class QuizDataView(APIView):
     # permission_classes = [IsAuthenticated]
 
@@ -104,16 +147,13 @@ class QuizDataView(APIView):
         task = get_object_or_404(Task, contentID=task_id)
         questions = task.questions.all().order_by('order')
 
-        # Get user's previous responses if any
+        # Get user's previous responses if any, in one query for the whole quiz
         user_responses = {}
-        for question in questions:
-            response = UserResponse.objects.filter(
-                user=request.user,
-                question=question
-            ).first()
-
-            if response:
-                user_responses[question.id] = response.response_text
+        for question_id, response_text in UserResponse.objects.filter(
+            user=request.user,
+            question__task=task
+        ).order_by('-submitted_at').values_list('question_id', 'response_text'):
+            user_responses.setdefault(question_id, response_text)
 
         # Prepare data for JSON response
         quiz_data = {
@@ -144,38 +184,134 @@ class AdminQuizResponsesView(APIView):
             return Response({"error": "You do not have permission to access this resource"},
                           status=status.HTTP_403_FORBIDDEN)
 
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = parse_datetime(request.query_params['since'])
+            except ValueError:
+                # well formed but impossible, like 2024-02-30T10:00:00
+                since = None
+            if since is None:
+                return Response({"error": "since must be an ISO 8601 timestamp"},
+                              status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
         task = get_object_or_404(Task, contentID=task_id)
         questions = task.questions.all().order_by('order')
 
-        # Collect all responses for this task
-        responses_data = []
-
-        for question in questions:
-            responses = UserResponse.objects.filter(
-                question=question
-            ).select_related('user')
+        # Fetch the responses for the whole task, or one page of them with ?limit=, and group them by question
+        responses = UserResponse.objects.filter(question__task=task).select_related('user').order_by(*QuizResponseCursorPagination.ordering)
+        if since:
+            responses = responses.filter(submitted_at__gt=since)
+
+        paginator = QuizResponseCursorPagination()
+        page = paginator.paginate_queryset(responses, request, view=self)
+        paginated = page is not None
+        if not paginated:
+            page = responses
+
+        responses_by_question = defaultdict(list)
+        for response in page:
+            responses_by_question[response.question_id].append({
+                'user_id': response.user.user_id,
+                'username': response.user.username,
+                'user_full_name': response.user.full_name(),
+                'response_text': response.response_text,
+                'submitted_at': response.submitted_at
+            })
 
-            question_data = {
+        responses_data = [
+            {
                 'question_id': question.id,
                 'question_text': question.question_text,
-                'responses': [
-                    {
-                        'user_id': response.user.user_id,
-                        'username': response.user.username,
-                        'user_full_name': response.user.full_name(),
-                        'response_text': response.response_text,
-                        'submitted_at': response.submitted_at
-                    } for response in responses
-                ]
-            }
-            responses_data.append(question_data)
+                'responses': responses_by_question[question.id]
+            } for question in questions
+        ]
 
         return Response({
             'task_id': str(task.contentID),
             'task_title': task.title,
-            'responses': responses_data
+            'responses': responses_data,
+            'next': paginator.get_next_link() if paginated else None,
+            'previous': paginator.get_previous_link() if paginated else None
         }, status=status.HTTP_200_OK)
 
+EXPORT_COLUMNS = [
+    ('task_id', 'question__task__contentID'),
+    ('task_title', 'question__task__title'),
+    ('question_id', 'question_id'),
+    ('question_order', 'question__order'),
+    ('question_text', 'question__question_text'),
+    ('user_id', 'user__user_id'),
+    ('username', 'user__username'),
+    ('first_name', 'user__first_name'),
+    ('last_name', 'user__last_name'),
+    ('response_text', 'response_text'),
+    ('submitted_at', 'submitted_at'),
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands each line straight back to the csv writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def stream_quiz_responses(responses, output, filename):
+    """Stream the given UserResponse rows as CSV or NDJSON without loading them all into memory"""
+    rows = (
+        responses.order_by('question__task', 'question__order', 'question_id', 'submitted_at', 'id')
+        .values_list(*[field for _, field in EXPORT_COLUMNS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    header = [name for name, _ in EXPORT_COLUMNS]
+
+    if output == 'ndjson':
+        lines = (json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n' for row in rows)
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    else:
+        writer = csv.writer(Echo())
+
+        def lines():
+            yield writer.writerow(header)
+            for row in rows:
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(lines(), content_type='text/csv')
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
+
+
+class AdminQuizResponsesExportView(APIView):
+    """Admin export of every response to a task as CSV (default) or NDJSON via ?output=ndjson"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id=None, module_id=None):
+        if (request.user.user_type != 'admin' and request.user.user_type != 'superadmin'):
+            return Response({"error": "You do not have permission to access this resource"},
+                          status=status.HTTP_403_FORBIDDEN)
+
+        output = request.query_params.get('output', 'csv')
+        if output not in ('csv', 'ndjson'):
+            return Response({"error": "output must be 'csv' or 'ndjson'"},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        if module_id is not None:
+            module = get_object_or_404(Module, id=module_id)
+            responses = UserResponse.objects.filter(question__task__moduleID=module)
+            filename = f'module-{module.id}-quiz-responses'
+        else:
+            task = get_object_or_404(Task, contentID=task_id)
+            responses = UserResponse.objects.filter(question__task=task)
+            filename = f'quiz-{task.contentID}-responses'
+
+        return stream_quiz_responses(responses, output, filename)
+
 class QuizQuestionView(APIView):
     """API endpoint for creating and managing quiz questions"""
 
@@ -325,6 +461,8 @@ class QuizQuestionView(APIView):
 class QuizQuestionViewSet(viewsets.ModelViewSet):
     queryset = QuizQuestion.objects.all()
     serializer_class= QuizQuestionSerializer
+    filter_fields = ('task',)
+    cursor_ordering = ('pk',)
 
 # views.py
 class QuizUserResponsesView(APIView):
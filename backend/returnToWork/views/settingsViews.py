@@ -1,9 +1,10 @@
 import uuid
-from io import BytesIO
 
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.http import HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 from rest_framework.views import APIView
@@ -11,10 +12,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from reportlab.pdfgen import canvas
-
 from returnToWork.models import (
-    ContentProgress, Task, QuizQuestion, UserResponse
+    ContentProgress, Task
+)
+from returnToWork.outbox import queue_mail
+from returnToWork.pagination import OptionalLimitOffsetPagination
+from returnToWork.task_pdf import (
+    load_task_answers, get_task_pdf, pdf_filename, stream_tasks_zip, ZIP_ARCHIVE_NAME
 )
 
 from returnToWork.serializers import (
@@ -47,12 +51,11 @@ class UserSettingsView(APIView):
         user.delete()
 
         if not User.objects.filter(username = username).exists():
-            send_mail(
+            queue_mail(
                 subject= "Account deletion",
                 message = f"Dear {username}, Your account has been successfully deleted.",
                 from_email = "readiness.to.return.to.work@gmail.com",
                 recipient_list=[user_email],
-                fail_silently=False,
                 )
             return Response({"message":"User account deleted successfully"},status=status.HTTP_204_NO_CONTENT)
 
@@ -73,33 +76,56 @@ class CompletedInteractiveContentView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # module = get_object_or_404(Module, pk=module_id)
-
         content_type = ContentType.objects.get_for_model(Task)
 
-        # module_task_ids = Task.objects.filter(moduleID=module).values_list('contentID', flat=True)
-
         viewed_tasks = ContentProgress.objects.filter(
             user=request.user,
             content_type=content_type,
-            # object_id__in=module_task_ids,
             viewed=True
-        )
+        ).order_by('-viewed_at', '-id')
 
-        results = []
-        for item in viewed_tasks:
-            try:
-                task = item.content_object
-                results.append({
-                    "content_id": str(item.object_id),
-                    "title": task.title,
-                    "viewed_at": item.viewed_at,
-                    "quiz_type": task.get_quiz_type_display(),
-                    "module_title": task.moduleID.title if task.moduleID else None
-                })
-            except:
+        # optional ?viewed_from= / ?viewed_to= range, as dates or ISO timestamps
+        for param, lookup in (('viewed_from', 'gte'), ('viewed_to', 'lte')):
+            value = request.query_params.get(param)
+            if not value:
                 continue
+            try:
+                day = parse_date(value)
+                moment = None if day else parse_datetime(value)
+            except ValueError:
+                # well formed but impossible, like 2024-02-30
+                day = moment = None
+            if day:
+                viewed_tasks = viewed_tasks.filter(**{f'viewed_at__date__{lookup}': day})
+            elif moment:
+                if timezone.is_naive(moment):
+                    moment = timezone.make_aware(moment)
+                viewed_tasks = viewed_tasks.filter(**{f'viewed_at__{lookup}': moment})
+            else:
+                return Response({"error": f"{param} must be a date or ISO 8601 timestamp"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # one query for every task and its module, however many tasks are completed
+        viewed_tasks = ContentProgress.with_content_objects(viewed_tasks)
+
+        paginator = OptionalLimitOffsetPagination()
+        page = paginator.paginate_queryset(viewed_tasks, request, view=self)
+        items = page if page is not None else viewed_tasks
 
+        results = []
+        for item in items:
+            task = item.content_object
+            if task is None:
+                continue
+            results.append({
+                "content_id": str(item.object_id),
+                "title": task.title,
+                "viewed_at": item.viewed_at,
+                "quiz_type": task.get_quiz_type_display(),
+                "module_title": task.moduleID.title if task.moduleID else None
+            })
+
+        if page is not None:
+            return paginator.get_paginated_response(results)
         return Response(results)
 
 class TaskPdfView(APIView):
@@ -112,30 +138,42 @@ class TaskPdfView(APIView):
             task = Task.objects.get(contentID = task_id)
         except Task.DoesNotExist:
             return Response({"error": "Task not found"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # get related questions 
-        questions = QuizQuestion.objects.filter(task = task)
-        
-        if not questions.exists():
+
+        # get related questions with the user's answers in one query
+        answers = load_task_answers(user, [task]).get(task.pk)
+
+        if not answers:
             return Response({"error": "No questions found for this task"}, status=status.HTTP_400_BAD_REQUEST)
 
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer)
-        pdf.drawString(100,800,f"Task:{task.title}")
+        name = get_task_pdf(user, task, answers)
+        if name is None:
+            return Response({"status": "rendering"}, status=status.HTTP_202_ACCEPTED, headers={"Retry-After": "2"})
 
-        y_position = 780
-        for question in questions:
-            response = UserResponse.objects.filter(user=user, question=question).first()
-            answer_text = response.response_text if response else "No response provided"
-            pdf.drawString(100, y_position, f"Question: {question.question_text}")
-            y_position -=20
-            pdf.drawString(120, y_position, f"Answer: {answer_text}")
-            y_position -=30
+        return FileResponse(
+            default_storage.open(name),
+            content_type="application/pdf",
+            as_attachment=True,
+            filename=pdf_filename(task)
+        )
 
-        pdf.save()
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{task.title.replace(" ", "-")}_completed.pdf"'
+class CompletedTasksZipView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return response
+    def get(self, request):
+        user = request.user
+        # the same tasks CompletedInteractiveContentView lists as completed
+        tasks = Task.objects.filter(
+            progress_records__user=user,
+            progress_records__viewed=True
+        ).distinct().order_by('title')
+
+        # questions and answers for every task in one query
+        answers = load_task_answers(user, tasks)
+        tasks = [task for task in tasks if answers.get(task.pk)]
 
+        if not tasks:
+            return Response({"error": "No completed tasks found"}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(stream_tasks_zip(tasks, answers), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="{ZIP_ARCHIVE_NAME}"'
+        return response
@@ -1,6 +1,5 @@
 import uuid
 from django.utils import timezone
-from django.core.mail import send_mail
 
 from django.contrib.auth import get_user_model
 from django.http import HttpResponse
@@ -18,9 +17,13 @@ from returnToWork.models import (
     QuizQuestion, RankingQuestion, Task, UserModuleInteraction, UserResponse
 )
 from returnToWork.serializers import UserSerializer
+from returnToWork.outbox import queue_mail
+from returnToWork.response_cache import cache_response
+from returnToWork.pagination import DefaultCursorPagination
 
 class TermsAndConditionsView(APIView):
     """API view for managing Terms and Conditions"""
+    @cache_response('terms')
     def get(self, request):
         """Get the current terms and conditions"""
         try:
@@ -67,6 +70,7 @@ class TermsAndConditionsView(APIView):
 class AdminUsersView(APIView):
     """API view for managing admin users"""
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('username',)
     
     def get(self, request):
         """Get list of admin users"""
@@ -76,7 +80,13 @@ class AdminUsersView(APIView):
                            status=status.HTTP_403_FORBIDDEN)
         
         # Get all users with user_type='admin'
-        admins = User.objects.filter(user_type='admin')
+        admins = UserSerializer.eager_load(User.objects.filter(user_type='admin'))
+
+        paginator = DefaultCursorPagination()
+        page = paginator.paginate_queryset(admins, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(UserSerializer(page, many=True).data)
+
         serializer = UserSerializer(admins, many=True)
         return Response(serializer.data)
     
@@ -148,12 +158,11 @@ class AdminUsersView(APIView):
                 print(f"Sending admin verification email to: {email}")
                 print(f"Verification URL: {verification_url}")
                 
-                send_mail(
+                queue_mail(
                     subject="Verify your admin account",
                     message=f"Dear {user.first_name},\n\nYou've been added as an admin by a superadmin. Please verify your email by clicking the following link: {verification_url}\n\nThis link will expire in 3 days.",
                     from_email="readiness.to.return.to.work@gmail.com",
                     recipient_list=[email],
-                    fail_silently=False,
                 )
 
                 print("Email sent successfully")
@@ -266,12 +275,11 @@ class ResendAdminVerificationView(APIView):
             # Send verification email
             verification_url = f"http://localhost:5173/verify-admin-email/{verification.verification_token}/"
             
-            send_mail(
+            queue_mail(
                 subject="Verify your admin account - Reminder",
                 message=f"Dear {admin.first_name},\n\nThis is a reminder to verify your admin account. Please click the following link to verify your email: {verification_url}\n\nThis link will expire in 3 days.",
                 from_email="readiness.to.return.to.work@gmail.com",
                 recipient_list=[admin.email],
-                fail_silently=False,
             )
             
             return Response({
@@ -326,42 +334,43 @@ class AdminUserDetailView(APIView):
                 
                 # 2. Transfer authorship for each content type
                 # for each content type that has an author field, update it
+                # (update() skips auto_now, so updated_at is set by hand to change the content ETags)
                 
                 # trasfer ownership of Task content
                 tasks = Task.objects.filter(author=admin_to_delete)
                 task_count = tasks.count()
                 if task_count > 0:
-                    tasks.update(author=superadmin)
+                    tasks.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of RankingQuestion content
                 ranking_questions = RankingQuestion.objects.filter(author=admin_to_delete)
                 rq_count = ranking_questions.count()
                 if rq_count > 0:
-                    ranking_questions.update(author=superadmin)
+                    ranking_questions.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of InlinePicture content
                 inline_pictures = Image.objects.filter(author=admin_to_delete)
                 ip_count = inline_pictures.count()
                 if ip_count > 0:
-                    inline_pictures.update(author=superadmin)
+                    inline_pictures.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of AudioClip content
                 audio_clips = AudioClip.objects.filter(author=admin_to_delete)
                 ac_count = audio_clips.count()
                 if ac_count > 0:
-                    audio_clips.update(author=superadmin)
+                    audio_clips.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of Document content
                 documents = Document.objects.filter(author=admin_to_delete)
                 doc_count = documents.count()
                 if doc_count > 0:
-                    documents.update(author=superadmin)
+                    documents.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of EmbeddedVideo content
                 videos = EmbeddedVideo.objects.filter(author=admin_to_delete)
                 video_count = videos.count()
                 if video_count > 0:
-                    videos.update(author=superadmin)
+                    videos.update(author=superadmin, updated_at=timezone.now())
                 
                 # Transfer ownership of InfoSheet content
                 # infosheets = Infosheet.objects.filter(author=admin_to_delete)
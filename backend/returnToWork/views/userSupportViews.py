@@ -1,14 +1,16 @@
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 
-import pusher
-
-from returnToWork.models import Conversation, Message, User
-from returnToWork.serializers import ConversationSerializer, MessageSerializer
+from returnToWork.models import Conversation, Message
+from returnToWork.serializers import ConversationListSerializer, MessageSerializer
+from returnToWork.pagination import ConversationCursorPagination, MessageCursorPagination
+from returnToWork import realtime
 
 class UserSupportView(APIView):
 
@@ -17,29 +19,16 @@ class UserSupportView(APIView):
 
     def get(self, request):
         user_ = request.user
-        data = request.data
-
-        
 
-       
-          
-        info_chats = Conversation.objects.filter(user = user_) if user_.user_type == "service user" else Conversation.objects.filter(Q(hasEngaged = False) | Q(admin=user_))
-        info_chats = info_chats.order_by('-updated_at')
-
-        if not info_chats:
-            return Response([], status=status.HTTP_200_OK)
-        
-        serialized_info = ConversationSerializer(info_chats, many=True)
-        
-        
-        updated_data = [ {**chat, "user_username": User.objects.get(id=chat.get('user')).username}  for chat in serialized_info.data]
-        
+        # username, unread count and last message come from the same query as the conversations
+        info_chats = Conversation.inbox_for(user_).order_by('-updated_at', '-id')
 
-        return Response(updated_data, status=status.HTTP_200_OK)
+        paginator = ConversationCursorPagination()
+        page = paginator.paginate_queryset(info_chats, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(ConversationListSerializer(page, many=True).data)
 
-       
-    
-        
+        return Response(ConversationListSerializer(info_chats, many=True).data, status=status.HTTP_200_OK)
 
     def post(self, request):
         user_ = request.user
@@ -116,8 +105,27 @@ class UserChatView(APIView):
       
             
         all_Messages = Message.objects.filter(conversation=conv_Obj)
-        
-        serialized_messages = MessageSerializer(all_Messages, many=True)
+        conv_Obj.mark_read(user_)
+
+        # ?after=<message id> returns only the messages sent since then, oldest first, for polling clients
+        after = request.query_params.get("after")
+        if after is not None:
+            if not after.isdigit():
+                return Response({"message": "after must be a message id"}, status=status.HTTP_400_BAD_REQUEST)
+            anchor = all_Messages.filter(id=after).values_list("timestamp", flat=True).first()
+            if anchor is None:
+                # otherwise an empty list would look like "no new messages" and the client would poll forever
+                return Response({"message": "after is not a message in this conversation"}, status=status.HTTP_404_NOT_FOUND)
+            new_Messages = all_Messages.filter(Q(timestamp__gt=anchor) | Q(timestamp=anchor, id__gt=after)).order_by("timestamp", "id")
+            return Response(MessageSerializer(new_Messages, many=True).data, status=status.HTTP_200_OK)
+
+        # ?limit= pages back through the history, newest first
+        paginator = MessageCursorPagination()
+        page = paginator.paginate_queryset(all_Messages, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
+        serialized_messages = MessageSerializer(all_Messages.order_by("timestamp", "id"), many=True)
         
         return Response(serialized_messages.data, status=status.HTTP_200_OK)
 
@@ -150,17 +158,10 @@ class UserChatView(APIView):
             file = uploaded_file
         )
 
-        conv_Obj.save() 
+        conv_Obj.lastMessage = message_content
+        conv_Obj.save(update_fields=["lastMessage", "updated_at"])
 
         
-        pusher_client = pusher.Pusher(
-            app_id='1963499',
-            key='d32d75089ef19c7a1669',
-            secret='6523d0f19e5a5a6db9b3',
-            cluster='eu',
-            ssl=True
-        )
-
         messageObj = {
             "message": message_content,
             "sender": user_.id,
@@ -169,14 +170,42 @@ class UserChatView(APIView):
 
         }
 
-        pusher_client.trigger(f"chat-room-{room_id}", "new-message", messageObj)
-            
-            
+        # delivered by a background worker once the message is committed
+        realtime.publish(realtime.chat_channel(room_id), "new-message", messageObj)
 
         return Response({"message": "Converation found"}, status=status.HTTP_200_OK)
 
 
-        
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
 
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
 
-    
+
+class UserChatEventsView(APIView):
+    """Server-sent events for a chat room, available when REALTIME_BACKEND is 'sse'"""
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, room_id):
+        user_ = request.user
+
+        backend = realtime.get_publisher().backend
+        if not isinstance(backend, realtime.ServerSentEventsBackend):
+            return Response({"message": "Server-sent events are not enabled"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            conv_Obj = Conversation.objects.get(id = room_id)
+        except Conversation.DoesNotExist:
+            return Response({"message": "Unable to find conversation"}, status=status.HTTP_404_NOT_FOUND)
+
+        if user_.user_type == "service user" and conv_Obj.user_id != user_.id:
+            return Response({"message": "Not a member of this conversation"}, status=status.HTTP_403_FORBIDDEN)
+
+        response = StreamingHttpResponse(realtime.stream_events(backend, realtime.chat_channel(room_id)), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -6,6 +8,20 @@ from rest_framework import status
 from returnToWork.models import User, Tags, Module, ProgressTracker
 from returnToWork.serializers import UserSerializer
 
+def replace_m2m(user, field_name, target_ids):
+    """Make the user's M2M rows match target_ids, inserting and deleting only the rows that differ"""
+    through = getattr(User, field_name).through
+    target_column = getattr(User, field_name).field.m2m_reverse_field_name() + '_id'
+
+    rows = through.objects.filter(user=user)
+    current_ids = set(rows.values_list(target_column, flat=True))
+    removed = current_ids - target_ids
+    if removed:
+        rows.filter(**{f'{target_column}__in': removed}).delete()
+    added = target_ids - current_ids
+    if added:
+        through.objects.bulk_create([through(user=user, **{target_column: target_id}) for target_id in added])
+
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self,request):
@@ -80,43 +96,31 @@ class UserDetail(APIView):
             fire_token = data.get('firebase_token')
             mod_data = data['module']
 
-
-            tags = []
-            modules = []
-
             if(fire_token):
                 user_in.firebase_token = fire_token
-            
-
-
-            for tag_obj in tag_data:
-
-                    if tag_obj['id']:
-                        tag_instance = Tags.objects.filter(tag=tag_obj['tag']).first()
-                        if tag_instance:
-                            tags.append(tag_instance)
-                        else:
-                            return Response({"detail": f"Tag ID not found."}, status=status.HTTP_404_NOT_FOUND)
-                    else:
-                        return Response({"detail": "Tag ID is missing."}, status=status.HTTP_400_BAD_REQUEST)
-
-
-            for module in mod_data:
-                if module['id']:
-                    mod_instance = Module.objects.filter(id=module['id']).first()
-                    if mod_instance:
-
-
-                        modules.append(mod_instance)
-                    else:
-                        return Response({"detail": f"Module ID not found."}, status=status.HTTP_404_NOT_FOUND)
-                else:
-                    return Response({"detail": "Module ID is missing."}, status=status.HTTP_400_BAD_REQUEST)
-
 
-            user_in.tags.set(tags)
-            user_in.module.set(modules)
-            user_in.save()
+            if not all(tag_obj['id'] for tag_obj in tag_data):
+                return Response({"detail": "Tag ID is missing."}, status=status.HTTP_400_BAD_REQUEST)
+            if not all(module['id'] for module in mod_data):
+                return Response({"detail": "Module ID is missing."}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Resolve every tag and module with one query each instead of one per item
+            tag_names = {tag_obj['tag'] for tag_obj in tag_data}
+            tag_ids = dict(Tags.objects.filter(tag__in=tag_names).values_list('tag', 'id'))
+            missing_tags = sorted(tag_names - tag_ids.keys())
+            if missing_tags:
+                return Response({"detail": "Tag ID not found.", "missing_tags": missing_tags}, status=status.HTTP_404_NOT_FOUND)
+
+            module_ids = {int(module['id']) for module in mod_data}
+            found_module_ids = set(Module.objects.filter(id__in=module_ids).values_list('id', flat=True))
+            missing_module_ids = sorted(module_ids - found_module_ids)
+            if missing_module_ids:
+                return Response({"detail": "Module ID not found.", "missing_module_ids": missing_module_ids}, status=status.HTTP_404_NOT_FOUND)
+
+            with transaction.atomic():
+                replace_m2m(user_in, 'tags', set(tag_ids.values()))
+                replace_m2m(user_in, 'module', found_module_ids)
+                user_in.save()
 
         except:
 
@@ -124,4 +128,5 @@ class UserDetail(APIView):
 
 
 
+        user = UserSerializer.eager_load(User.objects.filter(pk=user.pk)).get()
         return Response({"message": "Login Successful", "user": UserSerializer(user).data})
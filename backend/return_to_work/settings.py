@@ -144,6 +144,31 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024
 
+# How TaskPdfView renders PDFs that are not cached yet: 'inline' inside the request,
+# or 'thread' / 'process' to render on a background pool and answer 202 until it is ready
+TASK_PDF_RENDER_MODE = os.environ.get('TASK_PDF_RENDER_MODE', 'inline')
+TASK_PDF_RENDER_WORKERS = int(os.environ.get('TASK_PDF_RENDER_WORKERS', 2))
+
+# Cache shared by every web process: Redis (or a Redis-compatible server such as Valkey) when
+# REDIS_URL is set, otherwise files under CACHE_DIR. Tests swap in a per-process memory cache
+# through TEST_RUNNER.
+if os.environ.get('REDIS_URL'):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': os.environ['REDIS_URL']}}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', BASE_DIR / 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Read-mostly endpoints cache their response bodies for this long; changes invalidate them sooner through signals.
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+TEST_RUNNER = 'return_to_work.test_runner.CacheIsolatingTestRunner'
+
 STATIC_ROOT = BASE_DIR / 'staticfiles'  # Where collectstatic will put files
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
@@ -185,10 +210,26 @@ REST_FRAMEWORK = {
         # 'rest_framework.permissions.IsAuthenticated',  # Restrict API to authenticated users
         'rest_framework.permissions.AllowAny',  # Allows public access
     ),
-
+    # Lists are cursor paginated with ?limit=; set API_PAGE_SIZE to paginate every list by default
+    'DEFAULT_PAGINATION_CLASS': 'returnToWork.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': int(os.environ['API_PAGE_SIZE']) if os.environ.get('API_PAGE_SIZE') else None,
+    'DEFAULT_FILTER_BACKENDS': ['returnToWork.filters.FieldFilterBackend'],
 }
-
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 200))
+
+# Realtime chat events: 'pusher', 'sse' (only reaches clients of the same web process) or 'local'
+REALTIME_BACKEND = os.environ.get('REALTIME_BACKEND', 'pusher')
+PUSHER_APP_ID = os.environ.get('PUSHER_APP_ID', '1963499')
+PUSHER_KEY = os.environ.get('PUSHER_KEY', 'd32d75089ef19c7a1669')
+PUSHER_SECRET = os.environ.get('PUSHER_SECRET', '6523d0f19e5a5a6db9b3')
+PUSHER_CLUSTER = os.environ.get('PUSHER_CLUSTER', 'eu')
+
+# Set EMAIL_BACKEND to django.core.mail.backends.console.EmailBackend or .filebased.EmailBackend to test locally
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+# Queued email is sent on a background thread after each commit ('thread'),
+# or only by `manage.py send_queued_mail` ('command')
+EMAIL_OUTBOX_WORKER = os.environ.get('EMAIL_OUTBOX_WORKER', 'thread')
 EMAIL_HOST = 'smtp.gmail.com'  
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True  
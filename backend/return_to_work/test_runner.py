@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import iter_test_cases, override_settings
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+class CacheIsolatingTestRunner(DiscoverRunner):
+    """
+    Runs the suite against a per-process memory cache with response caching switched on, as in
+    production. Every test clears the cache when it finishes, because rolled back test data never
+    sends the signals that would otherwise expire what it cached. Uploads go to a temporary
+    MEDIA_ROOT that is removed afterwards, so the suite never writes into the source tree.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._media_root = tempfile.mkdtemp(prefix='return_to_work_media_')
+        self._test_settings = override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            RESPONSE_CACHE_ENABLED=True,
+            MEDIA_ROOT=self._media_root,
+        )
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        shutil.rmtree(self._media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        # a module level function, so the cleanup survives being sent to --parallel workers
+        for test in iter_test_cases(suite):
+            test.addCleanup(clear_caches)
+        return suite
@@ -14,15 +14,15 @@ from returnToWork.views import (
     CompletedContentView, MarkContentViewedView, ProgressTrackerView,
     TagViewSet, ModuleViewSet, TaskViewSet,
     UserInteractionView, LogInView, LogOutView, SignUpView, UserProfileView,
-    PasswordResetView, QuestionnaireView, UserDetail, ServiceUserListView,
+    PasswordResetView, QuestionnaireView, QuestionnaireTreeView, UserDetail, ServiceUserListView,
     DeleteServiceUserView, UserSettingsView, UserPasswordChangeView,
     CheckUsernameView,CheckEmailView, RequestPasswordResetView, ContentPublishView,
     RankingQuestionViewSet, AudioClipViewSet,
-    DocumentViewSet, EmbeddedVideoViewSet,  UserSupportView, UserChatView, QuizDataView, QuizDetailView,
-    QuizResponseView, AdminQuizResponsesView, QuizQuestionView,
-    TaskPdfView, QuizQuestionViewSet, VerifyEmailView, 
+    DocumentViewSet, EmbeddedVideoViewSet,  UserSupportView, UserChatView, UserChatEventsView, QuizDataView, QuizDetailView,
+    QuizResponseView, BulkQuizResponseView, AdminQuizResponsesView, AdminQuizResponsesExportView, QuizQuestionView,
+    TaskPdfView, CompletedTasksZipView, QuizQuestionViewSet, VerifyEmailView, 
     TermsAndConditionsView, AdminUsersView, AdminUserDetailView, CheckSuperAdminView, AcceptTermsView,
-    DocumentViewSet, AdminEmailVerificationView, ResendAdminVerificationView
+    DocumentViewSet, AdminEmailVerificationView, ResendAdminVerificationView, ModuleContentsView
 )
 from returnToWork.views import ProgressTrackerView,TagViewSet,ModuleViewSet, TaskViewSet, UserInteractionView, LogInView, LogOutView, SignUpView,UserProfileView,PasswordResetView, QuestionnaireView, UserDetail, ServiceUserListView, DeleteServiceUserView,UserSettingsView, UserPasswordChangeView, CheckUsernameView, RequestPasswordResetView, ContentPublishView,RankingQuestionViewSet, AudioClipViewSet, DocumentViewSet, EmbeddedVideoViewSet,  UserSupportView, UserChatView, ImageViewSet
 from returnToWork.views import  QuizDataView,QuizDetailView,QuizResponseView, AdminQuizResponsesView, QuizQuestionView,TaskPdfView,QuizQuestionViewSet, VerifyEmailView, CompletedInteractiveContentView, QuizUserResponsesView, AdminUserListView
@@ -59,6 +59,7 @@ urlpatterns = [
     path('api/', include(router.urls)),
     path('api/change-password/', PasswordResetView.as_view(), name='change-password'),
     path("api/questionnaire/", QuestionnaireView.as_view(), name="questionnaire"),
+    path("api/questionnaire/tree/", QuestionnaireTreeView.as_view(), name="questionnaire-tree"),
     path("service-users/", ServiceUserListView.as_view(), name="service-users-list"),
     path('api/admins/', AdminUserListView.as_view(), name='admin-users-list'),
     path("service-users/<str:username>/", DeleteServiceUserView.as_view(), name="delete-service-user"),
@@ -70,6 +71,7 @@ urlpatterns = [
     path("api/check-username/", CheckUsernameView.as_view(), name="check-username"),
     path("api/check-email/", CheckEmailView.as_view(), name="check-email"),
     path('api/download-completed-task/<uuid:task_id>/', TaskPdfView.as_view(), name='download-completed-task'),
+    path('api/download-completed-tasks/', CompletedTasksZipView.as_view(), name='download-completed-tasks'),
     path('api/accept-terms/', AcceptTermsView.as_view(), name='accept-terms'),
 
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -100,7 +102,10 @@ urlpatterns = [
     path('api/quiz/<uuid:task_id>/', QuizDetailView.as_view(), name='quiz_detail_api'),
     path('api/quiz/data/<uuid:task_id>/', QuizDataView.as_view(), name='quiz_data'),
     path('api/quiz/response/', QuizResponseView.as_view(), name='quiz_response'),
+    path('api/quiz/response/bulk/', BulkQuizResponseView.as_view(), name='quiz_response_bulk'),
     path('api/admin/quiz/responses/<uuid:task_id>/', AdminQuizResponsesView.as_view(), name='admin_quiz_responses'),
+    path('api/admin/quiz/responses/<uuid:task_id>/export/', AdminQuizResponsesExportView.as_view(), name='admin_quiz_responses_export'),
+    path('api/admin/modules/<int:module_id>/quiz/responses/export/', AdminQuizResponsesExportView.as_view(), name='admin_module_quiz_responses_export'),
     path('api/quiz/<str:task_id>/user-responses/', QuizUserResponsesView.as_view(), name='quiz-user-responses'),
 
     # Content Media Type
@@ -126,8 +131,11 @@ urlpatterns = [
     path('api/modules/<int:module_id>/images/', ImageViewSet.as_view({'get': 'list'}), name='module-images'),
     #Video API Endpoints
     path('api/modules/<int:module_id>/embedded-videos/', EmbeddedVideoViewSet.as_view({'get': 'list'}), name='module-embedded-videos'),
+    #All published content of a module in order
+    path('api/modules/<int:module_id>/contents/', ModuleContentsView.as_view(), name='module-contents'),
     #Support API Endpoints
     path('api/user-interaction/', UserInteractionView.as_view(), name='user-interaction'),
     path('api/support/chat-details/', UserSupportView.as_view(), name='user-support-view'),
     path('api/support/chat-room/<int:room_id>/', UserChatView.as_view(), name='user-chat-view'),
+    path('api/support/chat-room/<int:room_id>/events/', UserChatEventsView.as_view(), name='user-chat-events'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) 